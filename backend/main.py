@@ -4,45 +4,90 @@ GeoDataCheck API - FastAPI backend for geo data validation.
 Run with: uvicorn main:app --reload
 """
 
+import asyncio
+import heapq
 import io
 import json
+import os
+import time
 import uuid
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-import pandas as pd
+import orjson
 
-from validation import (
-    create_default_registry,
-    ValidationEngine,
-    ValidationResult,
-)
+# pandas/pyarrow and the rule registry are imported on first use, so a cold
+# start (the Fly machine scales to zero) can serve the frontend right away
+if TYPE_CHECKING:
+    import pandas as pd
+    from validation import ValidationEngine, ValidationResult
 
 
-# Session storage (in-memory, no persistence)
+# Session storage (in-memory, no persistence).
+# Sessions are local to this process, so the app must run as a single worker.
 sessions: Dict[str, dict] = {}
 SESSION_TIMEOUT_MINUTES = 30
 
+# Min-heap of (expires_at monotonic timestamp, session_id), swept periodically
+expiry_heap: List[Tuple[float, str]] = []
+SESSION_SWEEP_INTERVAL_SECONDS = 30
+
+# Upload limit for workflows that don't define input.max_size_mb
+MAX_FILE_SIZE_MB = int(os.getenv('MAX_FILE_SIZE_MB', '50'))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Upper bound for threads used by blocking file parsing / report generation
+MAX_WORKER_THREADS = min(8, os.cpu_count() or 1)
+
+# Worker processes for the rule engine (0 = validate in the request thread).
+# Each process holds its own pandas and rule registry, so leave this at 0 on
+# small single-CPU machines; raise it where several cores are available.
+VALIDATION_PROCESSES = int(os.getenv('VALIDATION_PROCESSES', '0'))
+validation_pool: Optional[ProcessPoolExecutor] = None
+
+# Threads running independent rules of one validation concurrently (1 = in turn)
+VALIDATION_RULE_THREADS = int(os.getenv('VALIDATION_RULE_THREADS', '1'))
+
+# Maximum auto-fitted column width in Excel reports (~50 characters)
+REPORT_MAX_COLUMN_WIDTH_PX = 355
+
+# Header cell style, matching the one pandas uses for to_excel()
+REPORT_HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+# Column headers of the report's Rules, Meta and Warnings tabs
+RULES_HEADERS = ('Regel-ID', 'Name', 'Beschreibung', 'Schweregrad', 'Kategorie', 'Standard aktiv')
+META_HEADERS = ('Typ', 'Spalte', 'Beschreibung', 'Format', 'Pflicht', 'Beispiel', 'Erlaubte Werte')
+WARNINGS_HEADERS = (
+    'bbl_id', 'Zeile', 'Regel-ID', 'Regel', 'Spalte', 'Wert', 'Schweregrad', 'Meldung', 'Vorschlag',
+)
+
+# Fallback names of the object ID column shown as bbl_id in the Warnings tab
+ID_COLUMN_CANDIDATES = ('bbl_id', 'id', 'ID', 'Id', 'BBL_ID', 'object_id', 'objekt_id')
+
 
 class SessionData:
     """In-memory session data, cleared on timeout."""
 
-    def __init__(self, df: pd.DataFrame, result: ValidationResult, config: dict):
+    def __init__(self, df: 'pd.DataFrame', result: 'ValidationResult', config: dict):
         self.df = df
         self.result = result
         self.config = config
         self.created_at = datetime.now()
-        self.expires_at = datetime.now() + timedelta(minutes=SESSION_TIMEOUT_MINUTES)
+        # Monotonic deadline: cheap to compare and immune to wall-clock jumps
+        self.expires_at = time.monotonic() + SESSION_TIMEOUT_MINUTES * 60
 
     def is_expired(self) -> bool:
-        return datetime.now() > self.expires_at
+        return time.monotonic() > self.expires_at
 
     def cleanup(self):
         """Explicitly clear data from memory."""
@@ -51,30 +96,97 @@ class SessionData:
         self.config = None
 
 
+def pack_dataframe(df: 'pd.DataFrame') -> Any:
+    """
+    Compact a DataFrame into LZ4-compressed Arrow IPC bytes (kept in memory).
+
+    Idle sessions then hold one contiguous buffer instead of pandas objects.
+    Returns the DataFrame unchanged if Arrow can't represent it (e.g. a column
+    mixing numbers and text, common in unvalidated Excel files).
+    """
+    import pyarrow as pa
+
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowException, ValueError, TypeError):
+        return df
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression='lz4')
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def unpack_dataframe(data: Any) -> Optional['pd.DataFrame']:
+    """Restore a DataFrame stored with pack_dataframe()."""
+    import pandas as pd
+    import pyarrow as pa
+
+    if data is None or isinstance(data, pd.DataFrame):
+        return data
+    return pa.ipc.open_file(data).read_pandas()
+
+
 def cleanup_expired_sessions():
-    """Remove expired sessions."""
-    expired = [
-        sid for sid, data in sessions.items()
-        if isinstance(data, SessionData) and data.is_expired()
-    ]
-    for sid in expired:
-        if sid in sessions:
-            sessions[sid].cleanup()
-            del sessions[sid]
+    """Remove expired sessions (only pops sessions whose deadline has passed)."""
+    now = time.monotonic()
+    while expiry_heap and expiry_heap[0][0] <= now:
+        _, sid = heapq.heappop(expiry_heap)
+        data = sessions.pop(sid, None)  # May already be deleted by the client
+        if isinstance(data, SessionData):
+            data.cleanup()
+        elif isinstance(data, dict):
+            data.clear()
+
+
+async def sweep_sessions_periodically():
+    """Background task: expire sessions every SESSION_SWEEP_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL_SECONDS)
+        cleanup_expired_sessions()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
+    global validation_pool
     # Startup
     print("GeoDataCheck API starting...")
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=MAX_WORKER_THREADS)
+    )
+    if VALIDATION_PROCESSES > 0:
+        validation_pool = ProcessPoolExecutor(max_workers=VALIDATION_PROCESSES)
+    sweeper = asyncio.create_task(sweep_sessions_periodically())
     yield
     # Shutdown - cleanup all sessions
     print("Cleaning up sessions...")
+    sweeper.cancel()
+    if validation_pool is not None:
+        validation_pool.shutdown(cancel_futures=True)
+        validation_pool = None
     for sid, data in sessions.items():
         if isinstance(data, SessionData):
             data.cleanup()
     sessions.clear()
+    expiry_heap.clear()
+
+
+class ReportAwareGZipMiddleware(GZipMiddleware):
+    """GZip responses, except Excel report downloads (xlsx is already zipped)."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/report"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson (C implementation, handles numpy scalars)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
 
 # Initialize FastAPI app
@@ -83,6 +195,7 @@ app = FastAPI(
     description="Geo data validation service for Swiss building portfolios",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS for frontend
@@ -94,9 +207,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize validation engine
-registry = create_default_registry()
-engine = ValidationEngine(registry)
+# Compress large JSON responses (validation results are very repetitive)
+app.add_middleware(ReportAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+@lru_cache(maxsize=None)
+def get_engine() -> 'ValidationEngine':
+    """Build the rule registry and validation engine on first use."""
+    from validation import create_default_registry, ValidationEngine
+
+    return ValidationEngine(create_default_registry(), max_workers=VALIDATION_RULE_THREADS)
 
 
 # Pydantic models for API
@@ -167,23 +286,33 @@ async def serve_assets(filename: str):
     raise HTTPException(status_code=404, detail=f"Asset not found: {filename}")
 
 
+@lru_cache(maxsize=None)
+def get_rules_payloads() -> Tuple[bytes, Dict[str, bytes]]:
+    """Serialize the rule documentation once: (all rules, rules per category)."""
+    from validation import Category
+
+    registry = get_engine().registry
+    all_rules = orjson.dumps({"rules": registry.get_documentation()})
+    by_category = {
+        cat.value: orjson.dumps({"rules": [r.metadata.to_dict() for r in registry.get_rules_by_category(cat)]})
+        for cat in Category
+    }
+    return all_rules, by_category
+
+
 @app.get("/api/rules")
 async def get_rules():
     """Get documentation for all validation rules."""
-    cleanup_expired_sessions()
-    return {"rules": registry.get_documentation()}
+    return Response(get_rules_payloads()[0], media_type="application/json")
 
 
 @app.get("/api/rules/{category}")
 async def get_rules_by_category(category: str):
     """Get rules by category."""
-    from validation import Category
-    try:
-        cat = Category(category)
-        rules = registry.get_rules_by_category(cat)
-        return {"rules": [r.metadata.to_dict() for r in rules]}
-    except ValueError:
+    payload = get_rules_payloads()[1].get(category)
+    if payload is None:
         raise HTTPException(status_code=400, detail=f"Invalid category: {category}")
+    return Response(payload, media_type="application/json")
 
 
 # ============================================================================
@@ -200,14 +329,12 @@ def load_workflows() -> List[Dict[str, Any]]:
 
 # Load workflows at startup
 WORKFLOWS = load_workflows()
+WORKFLOWS_BY_ID = {w['id']: w for w in WORKFLOWS}
 
 
 def get_workflow_by_id(workflow_id: str) -> Optional[Dict[str, Any]]:
     """Get a workflow by its ID."""
-    for workflow in WORKFLOWS:
-        if workflow['id'] == workflow_id:
-            return workflow
-    return None
+    return WORKFLOWS_BY_ID.get(workflow_id)
 
 
 @app.get("/api/workflows")
@@ -245,6 +372,73 @@ async def get_workflow(workflow_id: str):
 # Workflow-Centric Endpoints
 # ============================================================================
 
+def _read_upload_file(contents: io.BytesIO, file_ext: str, workflow: Dict[str, Any]) -> 'pd.DataFrame':
+    """
+    Parse uploaded file contents into a DataFrame.
+
+    Runs in a worker thread so parsing does not block the event loop.
+    """
+    import pandas as pd
+    from validation.base import TEXT_DTYPE
+
+    # Read based on file extension
+    if file_ext == '.csv':
+        df = pd.read_csv(contents)
+    else:
+        # For Excel files, auto-detect the best sheet
+        # (calamine parses .xlsx and .xls natively, much faster than openpyxl)
+        excel_file = pd.ExcelFile(contents, engine='calamine')
+        sheet_names = excel_file.sheet_names
+
+        if len(sheet_names) == 1:
+            # Only one sheet, use it
+            df = pd.read_excel(excel_file, sheet_name=0)
+        else:
+            # Multiple sheets - find the one with expected columns
+            # Get expected column names from workflow inputs
+            expected_cols = set()
+            for inp in workflow.get('inputs', []):
+                col_name = inp.get('name', inp.get('id', ''))
+                if col_name:
+                    expected_cols.add(col_name.lower())
+
+            best_sheet = None
+            best_score = -1
+
+            for sheet_name in sheet_names:
+                try:
+                    sheet_df = pd.read_excel(excel_file, sheet_name=sheet_name)
+                    if len(sheet_df) == 0:
+                        continue
+
+                    # Count matching columns (case-insensitive)
+                    sheet_cols = set(c.lower() for c in sheet_df.columns)
+                    matches = len(expected_cols & sheet_cols)
+
+                    # Prefer sheets with more matches, or more data if tied
+                    score = matches * 1000 + len(sheet_df)
+                    if score > best_score:
+                        best_score = score
+                        best_sheet = sheet_name
+                except Exception:
+                    continue
+
+            if best_sheet:
+                df = pd.read_excel(excel_file, sheet_name=best_sheet)
+            else:
+                # Fallback to first sheet
+                df = pd.read_excel(excel_file, sheet_name=0)
+
+    # Store pure-text columns as Arrow strings: contiguous UTF-8 buffers instead
+    # of Python str objects. Mixed columns (e.g. numbers and text) keep their
+    # original values so validation still sees them as uploaded.
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype(TEXT_DTYPE)
+
+    return df
+
+
 @app.post("/api/workflows/{workflow_id}/upload", response_model=UploadResponse)
 async def workflow_upload(workflow_id: str, file: UploadFile = File(...)):
     """
@@ -252,8 +446,6 @@ async def workflow_upload(workflow_id: str, file: UploadFile = File(...)):
 
     Returns session ID and detected column information.
     """
-    cleanup_expired_sessions()
-
     # Verify workflow exists
     workflow = get_workflow_by_id(workflow_id)
     if not workflow:
@@ -270,86 +462,45 @@ async def workflow_upload(workflow_id: str, file: UploadFile = File(...)):
             detail=f"Invalid file format. This workflow accepts: {', '.join(allowed_formats)}"
         )
 
-    # Check file size if specified
-    max_size_mb = input_config.get('max_size_mb')
-    if max_size_mb:
-        contents = await file.read()
-        if len(contents) > max_size_mb * 1024 * 1024:
+    # Read the upload in chunks, rejecting it as soon as it exceeds the size limit
+    max_size_mb = input_config.get('max_size_mb') or MAX_FILE_SIZE_MB
+    max_bytes = max_size_mb * 1024 * 1024
+    contents = io.BytesIO()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        if contents.tell() + len(chunk) > max_bytes:
             raise HTTPException(
-                status_code=400,
+                status_code=413,
                 detail=f"File too large. Maximum size: {max_size_mb} MB"
             )
-        await file.seek(0)  # Reset file position
+        contents.write(chunk)
+    contents.seek(0)
 
     try:
-        # Read file into memory
-        contents = await file.read()
-
-        # Read based on file extension
-        if file_ext == '.csv':
-            df = pd.read_csv(io.BytesIO(contents))
-        else:
-            # For Excel files, auto-detect the best sheet
-            excel_file = pd.ExcelFile(io.BytesIO(contents))
-            sheet_names = excel_file.sheet_names
-
-            if len(sheet_names) == 1:
-                # Only one sheet, use it
-                df = pd.read_excel(excel_file, sheet_name=0)
-            else:
-                # Multiple sheets - find the one with expected columns
-                # Get expected column names from workflow inputs
-                expected_cols = set()
-                for inp in workflow.get('inputs', []):
-                    col_name = inp.get('name', inp.get('id', ''))
-                    if col_name:
-                        expected_cols.add(col_name.lower())
-
-                best_sheet = None
-                best_score = -1
-
-                for sheet_name in sheet_names:
-                    try:
-                        sheet_df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                        if len(sheet_df) == 0:
-                            continue
-
-                        # Count matching columns (case-insensitive)
-                        sheet_cols = set(c.lower() for c in sheet_df.columns)
-                        matches = len(expected_cols & sheet_cols)
-
-                        # Prefer sheets with more matches, or more data if tied
-                        score = matches * 1000 + len(sheet_df)
-                        if score > best_score:
-                            best_score = score
-                            best_sheet = sheet_name
-                    except Exception:
-                        continue
-
-                if best_sheet:
-                    df = pd.read_excel(excel_file, sheet_name=best_sheet)
-                else:
-                    # Fallback to first sheet
-                    df = pd.read_excel(excel_file, sheet_name=0)
+        df = await asyncio.to_thread(_read_upload_file, contents, file_ext, workflow)
 
         if len(df) == 0:
             raise HTTPException(status_code=400, detail="File is empty")
 
         # Detect column mappings
-        detected = engine.detect_columns(df)
+        detected = get_engine().detect_columns(df)
+
+        # Build column info with samples, taken from the first rows only
+        # (formatted column-wise with astype(str), like the former per-column samples)
+        head = df.head(50)
+        head_text = head.astype(str).to_numpy(dtype=object)
+        head_present = head.notna().to_numpy()
+
+        # Reverse lookup: actual column -> first logical name detected for it
+        detected_by_column = {}
+        for logical, actual in detected.items():
+            detected_by_column.setdefault(actual, logical)
 
-        # Build column info with samples
         columns_info = []
-        for col in df.columns:
-            sample_values = df[col].dropna().head(3).astype(str).tolist()
-            detected_as = None
-            for logical, actual in detected.items():
-                if actual == col:
-                    detected_as = logical
-                    break
+        for i, col in enumerate(df.columns):
+            sample_values = head_text[head_present[:, i], i][:3].tolist()
             columns_info.append(ColumnInfo(
                 name=col,
-                detected_as=detected_as,
+                detected_as=detected_by_column.get(col),
                 sample_values=sample_values,
             ))
 
@@ -366,13 +517,17 @@ async def workflow_upload(workflow_id: str, file: UploadFile = File(...)):
 
         # Create session with workflow context
         session_id = str(uuid.uuid4())
+        expires_at = time.monotonic() + SESSION_TIMEOUT_MINUTES * 60
         sessions[session_id] = {
-            'df': df,
+            'df': pack_dataframe(df),
             'filename': file.filename,
             'workflow_id': workflow_id,
             'workflow': workflow,
+            'detected': detected,  # Reused by validate when no mapping is sent
             'created_at': datetime.now(),
+            'expires_at': expires_at,
         }
+        heapq.heappush(expiry_heap, (expires_at, session_id))
 
         return UploadResponse(
             session_id=session_id,
@@ -389,15 +544,39 @@ async def workflow_upload(workflow_id: str, file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
 
 
+def _validate_job(
+    data: Any,
+    validation_config: Dict[str, Any],
+    rule_ids: Optional[List[str]],
+    dimension_columns: Dict[str, str],
+) -> Tuple['ValidationResult', Dict[str, Any]]:
+    """
+    Run the rule engine and dimension breakdowns on (packed) session data.
+
+    Top-level so it can be dispatched to the validation process pool.
+    """
+    df = unpack_dataframe(data)
+    result = get_engine().validate(df, validation_config, rule_ids)
+
+    # Add dimension breakdowns if columns specified
+    breakdowns = {}
+    for dim_name, dim_col in dimension_columns.items():
+        if dim_col and dim_col in df.columns:
+            breakdowns[f'by_{dim_name}'] = result.get_errors_by_dimension(df, dim_col)
+
+    return result, breakdowns
+
+
 @app.post("/api/workflows/{workflow_id}/sessions/{session_id}/validate")
-async def workflow_validate(workflow_id: str, session_id: str, config: ValidationConfig):
+def workflow_validate(workflow_id: str, session_id: str, config: ValidationConfig):
     """
     Run validation for a specific workflow on uploaded data.
 
     Returns validation results with dimensional breakdowns.
-    """
-    cleanup_expired_sessions()
 
+    Plain (non-async) handler: FastAPI runs it in its threadpool, so the
+    CPU-bound validation and blocking GWR lookups don't stall the event loop.
+    """
     # Verify workflow exists
     workflow = get_workflow_by_id(workflow_id)
     if not workflow:
@@ -412,9 +591,12 @@ async def workflow_validate(workflow_id: str, session_id: str, config: Validatio
     if session.get('workflow_id') != workflow_id:
         raise HTTPException(status_code=400, detail="Session does not belong to this workflow")
 
-    df = session.get('df')
-    if df is None:
+    # Packed session data; decoded here only when needed, a validation worker
+    # process decodes its own copy
+    packed_df = session.get('df')
+    if packed_df is None:
         raise HTTPException(status_code=404, detail="Session data not available")
+    df = None
 
     # Build config - use workflow's default rules if none specified
     rule_ids = config.rule_ids
@@ -422,8 +604,13 @@ async def workflow_validate(workflow_id: str, session_id: str, config: Validatio
         # Use workflow's enabled rules by default
         rule_ids = [r['id'] for r in workflow['rules'] if r.get('default_enabled', True)]
 
+    columns = config.columns or session.get('detected')
+    if not columns:
+        df = unpack_dataframe(packed_df)
+        columns = get_engine().detect_columns(df)
+
     validation_config = {
-        'columns': config.columns or engine.detect_columns(df),
+        'columns': columns,
         'options': config.options,
     }
 
@@ -440,6 +627,9 @@ async def workflow_validate(workflow_id: str, session_id: str, config: Validatio
 
             from workflow import run_gwr_check, auto_detect_columns as gwr_auto_detect
 
+            if df is None:
+                df = unpack_dataframe(packed_df)
+
             # Use GWR workflow's own column detection (knows about av_egid, etc.)
             # Override the generic engine detection with GWR-specific detection
             gwr_columns = gwr_auto_detect(df)
@@ -453,120 +643,129 @@ async def workflow_validate(workflow_id: str, session_id: str, config: Validatio
             session['config'] = validation_config
             session['detected_gwr_columns'] = gwr_columns  # For export to find bbl_id etc.
 
-            return gwr_results
+            return ORJSONResponse(gwr_results)
 
         except ImportError as e:
             raise HTTPException(status_code=500, detail=f"GWR workflow module not available: {e}")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"GWR validation failed: {e}")
 
-    # Default: Run standard validation
-    result = engine.validate(df, validation_config, rule_ids)
+    # Default: Run standard validation (in a worker process if a pool is configured,
+    # which gets the compact Arrow session data rather than a pickled DataFrame)
+    if validation_pool is not None:
+        result, breakdowns = validation_pool.submit(
+            _validate_job, packed_df, validation_config, rule_ids, config.dimension_columns
+        ).result()
+    else:
+        # Reuses the frame if column detection already decoded it
+        data = packed_df if df is None else df
+        result, breakdowns = _validate_job(data, validation_config, rule_ids, config.dimension_columns)
 
     # Add dimensional analysis
     result_dict = result.to_dict()
-
-    # Add dimension breakdowns if columns specified
-    for dim_name, dim_col in config.dimension_columns.items():
-        if dim_col and dim_col in df.columns:
-            result_dict[f'by_{dim_name}'] = result.get_errors_by_dimension(df, dim_col)
+    result_dict.update(breakdowns)
 
     # Store result in session
     session['result'] = result
-    session['enriched_df'] = df  # No enrichment for standard validation
+    # No enrichment for standard validation; the report falls back to the original data
     session['config'] = validation_config
 
-    return result_dict
+    # Returned directly so the (potentially large) result skips jsonable_encoder
+    return ORJSONResponse(result_dict)
 
 
-@app.get("/api/workflows/{workflow_id}/sessions/{session_id}/report")
-async def workflow_download_report(workflow_id: str, session_id: str):
-    """
-    Download validation report for a workflow session.
+def _excel_cell(value: Any) -> Any:
+    """Convert a value for direct xlsxwriter output (missing -> blank, other types -> str)."""
+    import pandas as pd
 
-    Creates an Excel file with multiple tabs:
-    - Rules: Description of validation rules used
-    - Meta: Input/output column definitions
-    - Input: Original uploaded data
-    - Output: Enrichment result columns (bbl_id + gwr_* + eval_*)
-    - Warnings: All errors and warnings
+    if value is None or isinstance(value, (str, bool)):
+        return value
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if hasattr(value, 'item'):  # numpy scalar
+        return value.item()
+    return str(value)
+
+
+@lru_cache(maxsize=None)
+def _workflow_sheet_rows(workflow_id: str) -> Tuple[List[tuple], List[tuple]]:
     """
-    cleanup_expired_sessions()
+    Rows of the report's Rules and Meta tabs (built once per workflow).
 
-    # Verify workflow exists
+    They only depend on the workflow definition, which is loaded at startup.
+    """
     workflow = get_workflow_by_id(workflow_id)
-    if not workflow:
-        raise HTTPException(status_code=404, detail=f"Workflow not found: {workflow_id}")
 
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found or expired")
+    rules_rows = [
+        (
+            rule.get('id', ''),
+            rule.get('name_de', rule.get('name', '')),
+            rule.get('description_de', rule.get('description', '')),
+            rule.get('severity', ''),
+            rule.get('category', ''),
+            'Ja' if rule.get('default_enabled', True) else 'Nein',
+        )
+        for rule in workflow.get('rules', [])
+    ]
 
-    session = sessions[session_id]
+    meta_rows = [
+        (
+            col_type,
+            col.get('name', col.get('id', '')),
+            col.get('description', ''),
+            col.get('format', ''),
+            'Ja' if col.get('required', False) else 'Nein',
+            col.get('example', ''),
+            ', '.join(col.get('allowed_values', [])) if col.get('allowed_values') else '',
+        )
+        for col_type, key in (('Input', 'inputs'), ('Output', 'outputs'))
+        for col in workflow.get(key, [])
+    ]
 
-    # Verify session belongs to this workflow
-    if session.get('workflow_id') != workflow_id:
-        raise HTTPException(status_code=400, detail="Session does not belong to this workflow")
+    return rules_rows, meta_rows
 
-    result = session.get('result')
-    if result is None:
-        raise HTTPException(status_code=400, detail="No validation results. Run validation first.")
 
-    original_df = session.get('df')
+def _write_sheet(writer, sheet_name: str, headers: Tuple[str, ...], rows: List[tuple], header_format) -> None:
+    """Write a header row plus data rows straight to a new worksheet."""
+    worksheet = writer.book.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, headers, header_format)
+    for row, values in enumerate(rows, start=1):
+        worksheet.write_row(row, 0, values)
+
+
+def _build_report(workflow: Dict[str, Any], session: Dict[str, Any]) -> io.BytesIO:
+    """
+    Build the Excel report for a validated workflow session.
+
+    Runs in a worker thread so report generation does not block the event loop.
+    """
+    import pandas as pd
+
+    result = session['result']
+    original_df = unpack_dataframe(session.get('df'))
     enriched_df = session.get('enriched_df', original_df)  # Fallback to original if no enrichment
 
-    # Create Excel report
+    # Create Excel report (xlsxwriter keeps everything in memory, no temp files)
     output = io.BytesIO()
 
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output, engine='xlsxwriter', engine_kwargs={'options': {'in_memory': True}}) as writer:
+        # xlsxwriter formats belong to a workbook, so only the spec is shared
+        header_format = writer.book.add_format(REPORT_HEADER_FORMAT)
+        rules_rows, meta_rows = _workflow_sheet_rows(workflow['id'])
 
         # ─────────────────────────────────────────────────────────────────────
         # Tab 1: Rules - Description of validation rules used
         # ─────────────────────────────────────────────────────────────────────
-        rules = workflow.get('rules', [])
-        if rules:
-            rules_data = []
-            for rule in rules:
-                rules_data.append({
-                    'Regel-ID': rule.get('id', ''),
-                    'Name': rule.get('name_de', rule.get('name', '')),
-                    'Beschreibung': rule.get('description_de', rule.get('description', '')),
-                    'Schweregrad': rule.get('severity', ''),
-                    'Kategorie': rule.get('category', ''),
-                    'Standard aktiv': 'Ja' if rule.get('default_enabled', True) else 'Nein'
-                })
-            pd.DataFrame(rules_data).to_excel(writer, sheet_name='Rules', index=False)
+        if rules_rows:
+            _write_sheet(writer, 'Rules', RULES_HEADERS, rules_rows, header_format)
 
         # ─────────────────────────────────────────────────────────────────────
         # Tab 2: Meta - Input/output column definitions
         # ─────────────────────────────────────────────────────────────────────
-        meta_data = []
-
-        # Input columns
-        for col in workflow.get('inputs', []):
-            meta_data.append({
-                'Typ': 'Input',
-                'Spalte': col.get('name', col.get('id', '')),
-                'Beschreibung': col.get('description', ''),
-                'Format': col.get('format', ''),
-                'Pflicht': 'Ja' if col.get('required', False) else 'Nein',
-                'Beispiel': col.get('example', ''),
-                'Erlaubte Werte': ', '.join(col.get('allowed_values', [])) if col.get('allowed_values') else ''
-            })
-
-        # Output columns
-        for col in workflow.get('outputs', []):
-            meta_data.append({
-                'Typ': 'Output',
-                'Spalte': col.get('name', col.get('id', '')),
-                'Beschreibung': col.get('description', ''),
-                'Format': col.get('format', ''),
-                'Pflicht': 'Ja' if col.get('required', False) else 'Nein',
-                'Beispiel': col.get('example', ''),
-                'Erlaubte Werte': ', '.join(col.get('allowed_values', [])) if col.get('allowed_values') else ''
-            })
-
-        if meta_data:
-            pd.DataFrame(meta_data).to_excel(writer, sheet_name='Meta', index=False)
+        if meta_rows:
+            _write_sheet(writer, 'Meta', META_HEADERS, meta_rows, header_format)
 
         # ─────────────────────────────────────────────────────────────────────
         # Tab 3: Input - Original uploaded data
@@ -592,7 +791,7 @@ async def workflow_download_report(workflow_id: str, session_id: str):
 
         # Fallback to common names if not detected
         if not id_col and original_df is not None:
-            for possible_id in ['bbl_id', 'id', 'ID', 'Id', 'BBL_ID', 'object_id', 'objekt_id']:
+            for possible_id in ID_COLUMN_CANDIDATES:
                 if possible_id in original_df.columns:
                     id_col = possible_id
                     break
@@ -638,56 +837,77 @@ async def workflow_download_report(workflow_id: str, session_id: str):
         errors_list = result.get('errors', []) if isinstance(result, dict) else getattr(result, 'errors', [])
 
         if errors_list:
-            warnings_data = []
-            for e in errors_list:
+            # Rows are written straight to the sheet, no intermediate DataFrame
+            worksheet = writer.book.add_worksheet('Warnings')
+            worksheet.write_row(0, 0, WARNINGS_HEADERS, header_format)
+            id_values = original_df[id_col].to_numpy() if id_col else None
+
+            for row, e in enumerate(errors_list, start=1):
                 error_dict = e.to_dict() if hasattr(e, 'to_dict') else e
 
                 # Try to get bbl_id from the original data
                 bbl_id = ''
                 row_num = error_dict.get('row_number', error_dict.get('row_index'))
-                if row_num is not None and original_df is not None:
+                if row_num is not None and id_values is not None:
                     # row_number is Excel row (1-indexed + header), convert to df index
                     df_idx = row_num - 2 if isinstance(row_num, int) and row_num >= 2 else row_num
-                    if id_col and isinstance(df_idx, int) and 0 <= df_idx < len(original_df):
-                        try:
-                            bbl_id = original_df.iloc[df_idx][id_col]
-                        except (KeyError, IndexError):
-                            bbl_id = ''
-
-                warnings_data.append({
-                    'bbl_id': bbl_id,
-                    'Zeile': row_num,
-                    'Regel-ID': error_dict.get('rule_id', ''),
-                    'Regel': error_dict.get('rule_name', error_dict.get('rule_id', '')),
-                    'Spalte': error_dict.get('column', ''),
-                    'Wert': error_dict.get('value', ''),
-                    'Schweregrad': error_dict.get('severity', ''),
-                    'Meldung': error_dict.get('message', ''),
-                    'Vorschlag': error_dict.get('suggestion', '')
-                })
-
-            warnings_df = pd.DataFrame(warnings_data)
-            warnings_df.to_excel(writer, sheet_name='Warnings', index=False)
+                    if isinstance(df_idx, int) and 0 <= df_idx < len(id_values):
+                        bbl_id = id_values[df_idx]
+
+                worksheet.write_row(row, 0, [_excel_cell(v) for v in (
+                    bbl_id,
+                    row_num,
+                    error_dict.get('rule_id', ''),
+                    error_dict.get('rule_name', error_dict.get('rule_id', '')),
+                    error_dict.get('column', ''),
+                    error_dict.get('value', ''),
+                    error_dict.get('severity', ''),
+                    error_dict.get('message', ''),
+                    error_dict.get('suggestion', ''),
+                )])
 
         # ─────────────────────────────────────────────────────────────────────
         # Auto-fit column widths for all sheets
         # ─────────────────────────────────────────────────────────────────────
-        for sheet_name in writer.sheets:
-            worksheet = writer.sheets[sheet_name]
-            for column_cells in worksheet.columns:
-                max_length = 0
-                column_letter = column_cells[0].column_letter
-                for cell in column_cells:
-                    try:
-                        cell_value = str(cell.value) if cell.value is not None else ''
-                        max_length = max(max_length, len(cell_value))
-                    except:
-                        pass
-                # Add padding, cap at reasonable max width
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        # Uses the cell data xlsxwriter already holds, capped at a reasonable width
+        for worksheet in writer.sheets.values():
+            worksheet.autofit(max_width=REPORT_MAX_COLUMN_WIDTH_PX)
 
     output.seek(0)
+    return output
+
+
+@app.get("/api/workflows/{workflow_id}/sessions/{session_id}/report")
+async def workflow_download_report(workflow_id: str, session_id: str):
+    """
+    Download validation report for a workflow session.
+
+    Creates an Excel file with multiple tabs:
+    - Rules: Description of validation rules used
+    - Meta: Input/output column definitions
+    - Input: Original uploaded data
+    - Output: Enrichment result columns (bbl_id + gwr_* + eval_*)
+    - Warnings: All errors and warnings
+    """
+    # Verify workflow exists
+    workflow = get_workflow_by_id(workflow_id)
+    if not workflow:
+        raise HTTPException(status_code=404, detail=f"Workflow not found: {workflow_id}")
+
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    session = sessions[session_id]
+
+    # Verify session belongs to this workflow
+    if session.get('workflow_id') != workflow_id:
+        raise HTTPException(status_code=400, detail="Session does not belong to this workflow")
+
+    result = session.get('result')
+    if result is None:
+        raise HTTPException(status_code=400, detail="No validation results. Run validation first.")
+
+    output = await asyncio.to_thread(_build_report, workflow, session)
 
     filename = session.get('filename', 'data').replace('.xlsx', '').replace('.xls', '').replace('.csv', '')
     workflow_name = workflow['id'].replace('-', '_')
@@ -729,4 +949,6 @@ async def workflow_delete_session(workflow_id: str, session_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools come with uvicorn[standard]. Keep a single worker:
+    # sessions live in this process's memory.
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools", workers=1)
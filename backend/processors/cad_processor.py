@@ -12,20 +12,75 @@ The ezdxf library is used for reading DXF files.
 
 import io
 import os
+import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from enum import Enum
+from itertools import islice
 import math
 
+import numpy as np
+import orjson
+
 try:
     import ezdxf
+    from ezdxf import recover
     from ezdxf.entities import LWPolyline, Insert, Text, MText
+    from ezdxf.document import Drawing
+    from ezdxf.filemanagement import dxf_stream_info
+    from ezdxf.lldxf.tagger import binary_tags_loader
     EZDXF_AVAILABLE = True
 except ImportError:
     EZDXF_AVAILABLE = False
 
+# First bytes of a binary (non-ASCII) DXF file
+BINARY_DXF_SIGNATURE = b'AutoCAD Binary DXF'
+
+
+def read_dxf_file(path: str):
+    """
+    Load a DXF document from disk.
+
+    The fast ezdxf.readfile() loader is tried first; only structurally damaged
+    files pay for the slower recover loader.
+    """
+    try:
+        return ezdxf.readfile(path)
+    except ezdxf.DXFStructureError as e:
+        try:
+            doc, _auditor = recover.readfile(path)
+        except Exception:
+            raise e
+        return doc
+
+
+def read_dxf_bytes(data: bytes):
+    """
+    Load a DXF document (ASCII or binary) from memory, like ezdxf.readfile().
+
+    The text encoding is detected from the DXF header ($ACADVER/$DWGCODEPAGE).
+    Structurally damaged files fall back to the recover loader.
+    """
+    try:
+        if data.startswith(BINARY_DXF_SIGNATURE):
+            return Drawing.load(binary_tags_loader(data))
+
+        # Header values are ASCII, so any decoding is good enough to find the encoding.
+        # newline=None translates CRLF line endings like a file opened in text mode,
+        # otherwise the header values keep a trailing '\r'.
+        info = dxf_stream_info(io.StringIO(data.decode('utf-8', errors='ignore'), newline=None))
+        return ezdxf.read(io.StringIO(data.decode(info.encoding, errors='surrogateescape'), newline=None))
+    except ezdxf.DXFStructureError as e:
+        try:
+            doc, _auditor = recover.read(io.BytesIO(data))
+        except Exception:
+            raise e
+        return doc
+
 
 class Severity(Enum):
     ERROR = "error"
@@ -33,7 +88,7 @@ class Severity(Enum):
     INFO = "info"
 
 
-@dataclass
+@dataclass(slots=True)
 class CADValidationError:
     """Represents a validation error in a CAD file."""
     rule_id: str
@@ -56,7 +111,7 @@ class CADValidationError:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CADValidationResult:
     """Complete result of a CAD validation run."""
     filename: str
@@ -65,14 +120,25 @@ class CADValidationResult:
     layers_found: List[str] = field(default_factory=list)
     room_count: int = 0
     total_area: float = 0.0
+    # Maintained by add_error(), so the counts don't rescan the errors list
+    _error_count: int = field(default=0, init=False, repr=False)
+    _warning_count: int = field(default=0, init=False, repr=False)
+
+    def add_error(self, error: CADValidationError) -> None:
+        """Record a finding and update the severity counts."""
+        self.errors.append(error)
+        if error.severity is Severity.ERROR:
+            self._error_count += 1
+        elif error.severity is Severity.WARNING:
+            self._warning_count += 1
 
     @property
     def error_count(self) -> int:
-        return sum(1 for e in self.errors if e.severity == Severity.ERROR)
+        return self._error_count
 
     @property
     def warning_count(self) -> int:
-        return sum(1 for e in self.errors if e.severity == Severity.WARNING)
+        return self._warning_count
 
     @property
     def is_valid(self) -> bool:
@@ -91,6 +157,47 @@ class CADValidationResult:
             'total_area': round(self.total_area, 2),
         }
 
+    def to_summary_dict(self) -> dict:
+        """Counts and totals only, without the (possibly long) errors list."""
+        return {
+            'filename': self.filename,
+            'is_valid': self.is_valid,
+            'error_count': self.error_count,
+            'warning_count': self.warning_count,
+            'room_count': self.room_count,
+            'total_area': round(self.total_area, 2),
+        }
+
+    def to_json(self) -> bytes:
+        """
+        Serialize the full result (same shape as to_dict()) to JSON bytes.
+
+        orjson serializes the error dataclasses and Severity values natively,
+        so no intermediate dict is built per error.
+        """
+        return orjson.dumps({
+            'filename': self.filename,
+            'is_valid': self.is_valid,
+            'error_count': self.error_count,
+            'warning_count': self.warning_count,
+            'errors': self.errors,
+            'statistics': self.statistics,
+            'layers_found': self.layers_found,
+            'room_count': self.room_count,
+            'total_area': round(self.total_area, 2),
+        })
+
+
+@dataclass
+class CADDocumentIndex:
+    """Entities and blocks of a drawing, collected in one pass for all checks."""
+    by_layer: Dict[str, List[Any]] = field(default_factory=dict)  # Upper-case layer name
+    by_type: Dict[str, List[Any]] = field(default_factory=dict)  # DXF type, e.g. LWPOLYLINE
+    layer_counts: Dict[str, int] = field(default_factory=dict)  # Layer name as written
+    total_entities: int = 0
+    block_names_upper: List[str] = field(default_factory=list)  # Without anonymous (*) blocks
+    xref_names: List[str] = field(default_factory=list)
+
 
 # BBL Layer Standards
 BBL_REQUIRED_LAYERS = {
@@ -125,6 +232,12 @@ BBL_OPTIONAL_LAYERS = {
     'BBL_NORDPFEIL': {'color': 7, 'description': 'Nordpfeil'},
 }
 
+# Required layers keyed by upper-case name (layer names are case-insensitive)
+_BBL_REQUIRED_UPPER = {name.upper(): (name, spec) for name, spec in BBL_REQUIRED_LAYERS.items()}
+
+# Standard AutoCAD layers that are not reported as non-BBL layers
+_NON_BBL_SKIP = frozenset({'0', 'DEFPOINTS'})
+
 
 class CAFMBasisplanValidator:
     """
@@ -139,6 +252,7 @@ class CAFMBasisplanValidator:
             oda_converter_path: Path to ODA File Converter executable (optional)
         """
         self.oda_converter_path = oda_converter_path
+        self._oda_available = bool(oda_converter_path) and os.path.exists(oda_converter_path)
 
     def validate_file(self, file_path: str) -> CADValidationResult:
         """
@@ -150,57 +264,84 @@ class CAFMBasisplanValidator:
         Returns:
             CADValidationResult with all findings
         """
-        if not EZDXF_AVAILABLE:
-            result = CADValidationResult(filename=os.path.basename(file_path))
-            result.errors.append(CADValidationError(
-                rule_id="SYS-001",
-                rule_name="System",
-                severity=Severity.ERROR,
-                message="ezdxf library not installed. Run: pip install ezdxf",
-            ))
-            return result
+        return self.validate_files([file_path])[0]
 
-        filename = os.path.basename(file_path)
-        result = CADValidationResult(filename=filename)
+    def validate_files(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[CADValidationResult]:
+        """
+        Validate several DWG or DXF files.
 
-        # Handle DWG files (need conversion)
-        if file_path.lower().endswith('.dwg'):
-            dxf_path = self._convert_dwg_to_dxf(file_path)
-            if dxf_path is None:
-                result.errors.append(CADValidationError(
-                    rule_id="DWG-001",
-                    rule_name="Dateiformat",
+        All DWG files are converted together in a single ODA File Converter run.
+
+        Args:
+            file_paths: Paths to the CAD files
+            max_workers: Validate files in parallel in up to this many worker
+                processes (None or 1 = one after another in this process)
+
+        Returns:
+            One CADValidationResult per file, in the same order
+        """
+        results = [CADValidationResult(filename=os.path.basename(p)) for p in file_paths]
+
+        if not EZDXF_AVAILABLE:
+            for result in results:
+                result.add_error(CADValidationError(
+                    rule_id="SYS-001",
+                    rule_name="System",
                     severity=Severity.ERROR,
-                    message="DWG-Datei konnte nicht konvertiert werden. Bitte laden Sie eine DXF-Datei hoch oder installieren Sie ODA File Converter.",
+                    message="ezdxf library not installed. Run: pip install ezdxf",
                 ))
-                return result
-            file_path = dxf_path
+            return results
 
+        # Handle DWG files (need conversion)
+        with self.convert_many([p for p in file_paths if p.lower().endswith('.dwg')]) as converted:
+            jobs = []  # (position in file_paths, DXF path to validate)
+            for i, file_path in enumerate(file_paths):
+                if file_path.lower().endswith('.dwg'):
+                    if file_path not in converted:
+                        results[i].add_error(CADValidationError(
+                            rule_id="DWG-001",
+                            rule_name="Dateiformat",
+                            severity=Severity.ERROR,
+                            message="DWG-Datei konnte nicht konvertiert werden. Bitte laden Sie eine DXF-Datei hoch oder installieren Sie ODA File Converter.",
+                        ))
+                        continue
+                    jobs.append((i, converted[file_path]))
+                else:
+                    jobs.append((i, file_path))
+
+            if max_workers is not None and max_workers > 1 and len(jobs) > 1:
+                # Largest files first, so the slowest ones don't start last
+                jobs.sort(key=lambda job: _file_size(job[1]), reverse=True)
+                with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                    futures = [
+                        (i, pool.submit(_validate_dxf_in_worker, dxf_path, results[i].filename))
+                        for i, dxf_path in jobs
+                    ]
+                    for i, future in futures:
+                        results[i] = future.result()
+            else:
+                for i, dxf_path in jobs:
+                    self._validate_dxf_file(dxf_path, results[i])
+
+        return results
+
+    def _validate_dxf_file(self, dxf_path: str, result: CADValidationResult):
+        """Read a DXF file and run all validations on it."""
         try:
-            doc = ezdxf.readfile(file_path)
+            doc = read_dxf_file(dxf_path)
         except Exception as e:
-            result.errors.append(CADValidationError(
-                rule_id="DWG-001",
-                rule_name="Dateiformat",
-                severity=Severity.ERROR,
-                message=f"Datei konnte nicht gelesen werden: {str(e)}",
-            ))
-            return result
-
-        # Run all validations
-        self._validate_drawing_setup(doc, result)
-        self._validate_layers(doc, result)
-        self._validate_room_polygons(doc, result)
-        self._validate_blocks(doc, result)
-        self._validate_xrefs(doc, result)
-        self._collect_statistics(doc, result)
+            result.add_error(self._unreadable_file_error(e))
+            return
 
-        return result
+        self._validate_document(doc, result)
 
     def validate_bytes(self, file_bytes: bytes, filename: str) -> CADValidationResult:
         """
         Validate CAD file from bytes.
 
+        DXF files are parsed directly from memory; DWG files go through a
+        temporary file because the ODA converter needs a path.
+
         Args:
             file_bytes: File content as bytes
             filename: Original filename
@@ -208,6 +349,17 @@ class CAFMBasisplanValidator:
         Returns:
             CADValidationResult
         """
+        if EZDXF_AVAILABLE and filename.lower().endswith('.dxf'):
+            result = CADValidationResult(filename=os.path.basename(filename))
+            try:
+                doc = read_dxf_bytes(file_bytes)
+            except Exception as e:
+                result.add_error(self._unreadable_file_error(e))
+                return result
+
+            self._validate_document(doc, result)
+            return result
+
         # Write to temp file
         suffix = '.dxf' if filename.lower().endswith('.dxf') else '.dwg'
         with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
@@ -219,56 +371,105 @@ class CAFMBasisplanValidator:
         finally:
             os.unlink(tmp_path)
 
-    def _convert_dwg_to_dxf(self, dwg_path: str) -> Optional[str]:
+    def _unreadable_file_error(self, exc: Exception) -> CADValidationError:
+        """Error reported when the drawing can't be parsed."""
+        return CADValidationError(
+            rule_id="DWG-001",
+            rule_name="Dateiformat",
+            severity=Severity.ERROR,
+            message=f"Datei konnte nicht gelesen werden: {str(exc)}",
+        )
+
+    def _validate_document(self, doc, result: CADValidationResult):
+        """Run all validations on a loaded DXF document."""
+        # Walk modelspace and blocks once, then run all validations on the index
+        index = self._build_index(doc)
+        self._validate_drawing_setup(doc, result)
+        self._validate_layers(doc, result)
+        self._validate_room_polygons(index, result)
+        self._validate_blocks(index, result)
+        self._validate_xrefs(index, result)
+        self._collect_statistics(index, result)
+
+    @contextmanager
+    def convert_many(self, dwg_paths: List[str]) -> Iterator[Dict[str, str]]:
         """
-        Convert DWG to DXF using ODA File Converter.
+        Convert DWG files to DXF using ODA File Converter, in a single run.
 
-        Returns path to DXF file or None if conversion failed.
+        Yields the converted DXF path per input path; files that could not be
+        converted are missing. The DXF files are read in place and deleted
+        when the with-block exits.
         """
-        if not self.oda_converter_path or not os.path.exists(self.oda_converter_path):
-            return None
+        if not self._oda_available or not dwg_paths:
+            yield {}
+            return
 
-        # Create temp directory for output
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            input_dir = os.path.dirname(dwg_path)
-            input_file = os.path.basename(dwg_path)
+        converted = {}
+        with tempfile.TemporaryDirectory() as output_dir:
+            with tempfile.TemporaryDirectory() as input_dir:
+                # Numbered copies, so inputs with the same name from different folders don't clash.
+                # Unreadable inputs are left out and reported as not converted.
+                copied = 0
+                for i, dwg_path in enumerate(dwg_paths):
+                    try:
+                        shutil.copyfile(dwg_path, os.path.join(input_dir, f'{i}.dwg'))
+                    except OSError:
+                        continue
+                    copied += 1
+
+                if copied:
+                    try:
+                        # ODA File Converter command line:
+                        # ODAFileConverter "Input Folder" "Output Folder" ACAD2018 DXF 0 1 "*.dwg"
+                        subprocess.run([
+                            self.oda_converter_path,
+                            input_dir,
+                            output_dir,
+                            "ACAD2018",
+                            "DXF",
+                            "0",  # Recurse: 0=No
+                            "1",  # Audit: 1=Yes
+                            "*.dwg",
+                        ], capture_output=True, timeout=60 * copied)
+                    except (OSError, subprocess.SubprocessError):
+                        pass
+
+            # Files ODA could not convert have no output
+            for i, dwg_path in enumerate(dwg_paths):
+                dxf_path = os.path.join(output_dir, f'{i}.dxf')
+                if os.path.exists(dxf_path):
+                    converted[dwg_path] = dxf_path
 
-            try:
-                # ODA File Converter command line:
-                # ODAFileConverter "Input Folder" "Output Folder" ACAD2018 DXF 0 1
-                subprocess.run([
-                    self.oda_converter_path,
-                    input_dir,
-                    tmp_dir,
-                    "ACAD2018",
-                    "DXF",
-                    "0",  # Recurse: 0=No
-                    "1",  # Audit: 1=Yes
-                    input_file,
-                ], check=True, capture_output=True, timeout=60)
-
-                # Find output DXF
-                dxf_file = os.path.splitext(input_file)[0] + '.dxf'
-                dxf_path = os.path.join(tmp_dir, dxf_file)
+            yield converted
 
-                if os.path.exists(dxf_path):
-                    # Copy to persistent temp file
-                    with tempfile.NamedTemporaryFile(suffix='.dxf', delete=False) as out:
-                        with open(dxf_path, 'rb') as f:
-                            out.write(f.read())
-                        return out.name
+    def _build_index(self, doc) -> CADDocumentIndex:
+        """Index modelspace entities by layer and type, and collect block names."""
+        index = CADDocumentIndex()
+        by_layer = index.by_layer
+        by_type = index.by_type
+        layer_counts = index.layer_counts
 
-            except Exception:
-                pass
+        for entity in doc.modelspace():
+            layer = entity.dxf.layer
+            layer_counts[layer] = layer_counts.get(layer, 0) + 1
+            by_layer.setdefault(layer.upper(), []).append(entity)
+            by_type.setdefault(entity.dxftype(), []).append(entity)
+            index.total_entities += 1
 
-        return None
+        for block in doc.blocks:
+            if not block.name.startswith('*'):
+                index.block_names_upper.append(block.name.upper())
+            if block.block.is_xref:
+                index.xref_names.append(block.name)
+
+        return index
 
     def _validate_drawing_setup(self, doc, result: CADValidationResult):
         """Validate drawing units and setup."""
         # Check units
         units = doc.header.get('$INSUNITS', 0)
         if units != 6:  # 6 = Meters
-            result.errors.append(CADValidationError(
+            result.add_error(CADValidationError(
                 rule_id="DWG-004",
                 rule_name="Einheiten",
                 severity=Severity.WARNING,
@@ -276,9 +477,9 @@ class CAFMBasisplanValidator:
             ))
 
         # Check for layouts
-        layouts = [l.name for l in doc.layouts if l.name != 'Model']
-        if not layouts:
-            result.errors.append(CADValidationError(
+        has_layout = any(l.name != 'Model' for l in doc.layouts)
+        if not has_layout:
+            result.add_error(CADValidationError(
                 rule_id="DWG-013",
                 rule_name="Layout",
                 severity=Severity.WARNING,
@@ -287,53 +488,55 @@ class CAFMBasisplanValidator:
 
     def _validate_layers(self, doc, result: CADValidationResult):
         """Validate layer structure against BBL standards."""
-        existing_layers = {layer.dxf.name.upper(): layer for layer in doc.layers}
-        result.layers_found = list(existing_layers.keys())
+        existing_layers = {layer.dxf.name: layer for layer in doc.layers}
+        result.layers_found = list(existing_layers.keys())  # Spelled as in the drawing
+        # Layer names are case-insensitive, so upper-case each one once for lookups
+        upper_names = {name.upper(): name for name in existing_layers}
 
         # Check required layers
-        for layer_name, spec in BBL_REQUIRED_LAYERS.items():
-            if layer_name.upper() not in existing_layers:
+        for layer_upper, (layer_name, spec) in _BBL_REQUIRED_UPPER.items():
+            layer = existing_layers.get(upper_names.get(layer_upper))
+            if layer is None:
                 severity = Severity.ERROR if spec.get('required') else Severity.WARNING
-                result.errors.append(CADValidationError(
+                result.add_error(CADValidationError(
                     rule_id=f"LAY-{layer_name[-3:]}",
                     rule_name="Layer-Struktur",
                     severity=severity,
                     message=f"Pflichtlayer fehlt: {layer_name} ({spec['description']})",
                     layer=layer_name,
                 ))
-            else:
-                # Check layer color
-                layer = existing_layers[layer_name.upper()]
-                if layer.color != spec['color']:
-                    result.errors.append(CADValidationError(
-                        rule_id=f"LAY-{layer_name[-3:]}",
-                        rule_name="Layer-Farbe",
-                        severity=Severity.WARNING,
-                        message=f"Layer {layer_name} hat falsche Farbe: {layer.color} (erwartet: {spec['color']})",
-                        layer=layer_name,
-                    ))
-
-        # Check for non-BBL layers (info only)
-        non_bbl_layers = [l for l in existing_layers.keys()
-                         if not l.startswith('BBL_') and l not in ('0', 'DEFPOINTS')]
+            elif layer.color != spec['color']:
+                # Layer exists but has the wrong color
+                result.add_error(CADValidationError(
+                    rule_id=f"LAY-{layer_name[-3:]}",
+                    rule_name="Layer-Farbe",
+                    severity=Severity.WARNING,
+                    message=f"Layer {layer_name} hat falsche Farbe: {layer.color} (erwartet: {spec['color']})",
+                    layer=layer_name,
+                ))
+
+        # Check for non-BBL layers (info only, first 10)
+        non_bbl_layers = list(islice(
+            (name for upper, name in upper_names.items()
+             if not upper.startswith('BBL_') and upper not in _NON_BBL_SKIP), 10
+        ))
         if non_bbl_layers:
-            result.statistics['non_bbl_layers'] = non_bbl_layers[:10]  # First 10
+            result.statistics['non_bbl_layers'] = non_bbl_layers
 
-    def _validate_room_polygons(self, doc, result: CADValidationResult):
+    def _validate_room_polygons(self, index: CADDocumentIndex, result: CADValidationResult):
         """Validate room polygons on BBL_RAUM_POLYGON layer."""
-        msp = doc.modelspace()
-
         # Find room polygons
         room_layer = 'BBL_RAUM_POLYGON'
-        room_polygons = [e for e in msp.query(f'LWPOLYLINE[layer=="{room_layer}"]')]
+        candidates = [e for e in index.by_layer.get(room_layer.upper(), [])
+                      if e.dxftype() == 'LWPOLYLINE']
+        room_polygons = [e for e in candidates if e.dxf.layer == room_layer]
 
         if not room_polygons:
-            # Also check uppercase
-            room_polygons = [e for e in msp.query('LWPOLYLINE')
-                           if e.dxf.layer.upper() == room_layer.upper()]
+            # Also check other spellings of the layer name
+            room_polygons = candidates
 
         if not room_polygons:
-            result.errors.append(CADValidationError(
+            result.add_error(CADValidationError(
                 rule_id="RPO-001",
                 rule_name="Raumpolygone",
                 severity=Severity.ERROR,
@@ -345,37 +548,39 @@ class CAFMBasisplanValidator:
         result.room_count = len(room_polygons)
         total_area = 0.0
 
-        for poly in room_polygons:
+        # Read every polygon's vertices once into flat arrays, then compute all
+        # areas and centroids together
+        xs, ys, counts = self._pack_vertices(room_polygons)
+        areas, centroids = self._polygon_metrics(xs, ys, counts)
+
+        for poly, area, centroid in zip(room_polygons, areas, centroids):
             # Check if closed
             if not poly.closed:
-                result.errors.append(CADValidationError(
+                result.add_error(CADValidationError(
                     rule_id="RPO-002",
                     rule_name="Raumpolygon geschlossen",
                     severity=Severity.ERROR,
                     message=f"Raumpolygon ist nicht geschlossen",
                     layer=room_layer,
                     entity_handle=poly.dxf.handle,
-                    location=self._get_centroid(poly),
+                    location=centroid,
                 ))
 
-            # Calculate area
-            try:
-                area = abs(self._calculate_polygon_area(poly))
-                total_area += area
-
-                # Check minimum area
-                if area < 1.0:
-                    result.errors.append(CADValidationError(
-                        rule_id="RPO-005",
-                        rule_name="Raumpolygon Mindestfläche",
-                        severity=Severity.WARNING,
-                        message=f"Raumpolygon hat sehr kleine Fläche: {area:.2f} m²",
-                        layer=room_layer,
-                        entity_handle=poly.dxf.handle,
-                        location=self._get_centroid(poly),
-                    ))
-            except Exception:
-                pass
+            if area is None:
+                continue  # Vertices could not be read
+            total_area += area
+
+            # Check minimum area
+            if area < 1.0:
+                result.add_error(CADValidationError(
+                    rule_id="RPO-005",
+                    rule_name="Raumpolygon Mindestfläche",
+                    severity=Severity.WARNING,
+                    message=f"Raumpolygon hat sehr kleine Fläche: {area:.2f} m²",
+                    layer=room_layer,
+                    entity_handle=poly.dxf.handle,
+                    location=centroid,
+                ))
 
         result.total_area = total_area
 
@@ -384,14 +589,19 @@ class CAFMBasisplanValidator:
         if len(room_polygons) > 1:
             result.statistics['room_overlap_check'] = 'Vereinfachte Prüfung - manuelle Kontrolle empfohlen'
 
-    def _validate_blocks(self, doc, result: CADValidationResult):
+    def _validate_blocks(self, index: CADDocumentIndex, result: CADValidationResult):
         """Validate required blocks."""
-        block_names = [b.name.upper() for b in doc.blocks if not b.name.startswith('*')]
+        block_names = index.block_names_upper
+
+        # Search all names at once (substring search runs in C over one string);
+        # the newline separator keeps every match within a single block name
+        all_names = '\n'.join(block_names)
+        has_plankopf = 'PLANKOPF' in all_names or 'TITLEBLOCK' in all_names
+        has_nordpfeil = 'NORD' in all_names or 'NORTH' in all_names
 
         # Check for Plankopf
-        has_plankopf = any('PLANKOPF' in name or 'TITLEBLOCK' in name for name in block_names)
         if not has_plankopf:
-            result.errors.append(CADValidationError(
+            result.add_error(CADValidationError(
                 rule_id="BLK-004",
                 rule_name="Plankopf",
                 severity=Severity.WARNING,
@@ -399,9 +609,8 @@ class CAFMBasisplanValidator:
             ))
 
         # Check for Nordpfeil
-        has_nordpfeil = any('NORD' in name or 'NORTH' in name for name in block_names)
         if not has_nordpfeil:
-            result.errors.append(CADValidationError(
+            result.add_error(CADValidationError(
                 rule_id="BLK-003",
                 rule_name="Nordpfeil",
                 severity=Severity.WARNING,
@@ -411,65 +620,106 @@ class CAFMBasisplanValidator:
         result.statistics['block_count'] = len(block_names)
         result.statistics['blocks'] = block_names[:20]  # First 20
 
-    def _validate_xrefs(self, doc, result: CADValidationResult):
+    def _validate_xrefs(self, index: CADDocumentIndex, result: CADValidationResult):
         """Check for external references."""
-        xrefs = [b.name for b in doc.blocks if b.is_xref]
+        xrefs = index.xref_names
         if xrefs:
-            result.errors.append(CADValidationError(
+            result.add_error(CADValidationError(
                 rule_id="DWG-010",
                 rule_name="Externe Referenzen",
                 severity=Severity.ERROR,
                 message=f"Externe Referenzen gefunden: {', '.join(xrefs)}. XREFs müssen aufgelöst werden.",
             ))
 
-    def _collect_statistics(self, doc, result: CADValidationResult):
+    def _collect_statistics(self, index: CADDocumentIndex, result: CADValidationResult):
         """Collect drawing statistics."""
-        msp = doc.modelspace()
-
-        # Count entities by type
-        entity_counts = {}
-        for entity in msp:
-            etype = entity.dxftype()
-            entity_counts[etype] = entity_counts.get(etype, 0) + 1
+        # Count entities by type and per layer (counted while building the index)
+        entity_counts = {etype: len(entities) for etype, entities in index.by_type.items()}
+        layer_counts = index.layer_counts
 
         result.statistics['entity_counts'] = entity_counts
-        result.statistics['total_entities'] = sum(entity_counts.values())
-
-        # Count entities per layer
-        layer_counts = {}
-        for entity in msp:
-            layer = entity.dxf.layer
-            layer_counts[layer] = layer_counts.get(layer, 0) + 1
+        result.statistics['total_entities'] = index.total_entities
 
         result.statistics['entities_per_layer'] = dict(sorted(
             layer_counts.items(), key=lambda x: -x[1]
         )[:15])  # Top 15 layers
 
-    def _calculate_polygon_area(self, polyline) -> float:
-        """Calculate area of a polyline using shoelace formula."""
-        points = list(polyline.get_points())
-        if len(points) < 3:
-            return 0.0
-
-        n = len(points)
-        area = 0.0
-        for i in range(n):
-            j = (i + 1) % n
-            area += points[i][0] * points[j][1]
-            area -= points[j][0] * points[i][1]
-        return abs(area) / 2.0
-
-    def _get_centroid(self, polyline) -> Optional[Tuple[float, float]]:
-        """Get approximate centroid of a polyline."""
-        try:
-            points = list(polyline.get_points())
-            if not points:
-                return None
-            x = sum(p[0] for p in points) / len(points)
-            y = sum(p[1] for p in points) / len(points)
-            return (round(x, 2), round(y, 2))
-        except Exception:
-            return None
+    def _pack_vertices(self, polylines: List[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pack the vertices of many polylines into flat x and y arrays (CSR layout).
+
+        Returns (xs, ys, counts); counts[i] is the number of vertices of
+        polyline i, or -1 if its vertices could not be read.
+        """
+        vertices: List[Tuple[float, float]] = []
+        counts: List[int] = []
+        for polyline in polylines:
+            try:
+                points = polyline.get_points('xy')
+            except Exception:
+                counts.append(-1)
+                continue
+            vertices.extend(points)
+            counts.append(len(points))
+
+        xs, ys = np.array(vertices, dtype=np.float64).reshape(-1, 2).T
+        return np.ascontiguousarray(xs), np.ascontiguousarray(ys), np.array(counts, dtype=np.int64)
+
+    def _polygon_metrics(
+        self, xs: np.ndarray, ys: np.ndarray, counts: np.ndarray
+    ) -> Tuple[List[Optional[float]], List[Optional[Tuple[float, float]]]]:
+        """
+        Shoelace area and approximate centroid (vertex mean) of packed polygons.
+
+        Runs as segment reductions over the flat vertex arrays, with no
+        per-polygon or per-vertex Python loop. Unreadable polygons (count -1)
+        get no area and no centroid; empty ones an area of 0.
+        """
+        areas: List[Optional[float]] = [None if n < 0 else 0.0 for n in counts.tolist()]
+        centroids: List[Optional[Tuple[float, float]]] = [None] * len(counts)
+
+        filled = np.flatnonzero(counts > 0)
+        if len(filled) == 0:
+            return areas, centroids
+
+        sizes = counts[filled]
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        # Index of the next vertex, wrapping around to each polygon's first one
+        following = np.arange(1, len(xs) + 1)
+        following[starts + sizes - 1] = starts
+
+        # Shift to each polygon's first vertex: LV95 coordinates are in the
+        # millions, and multiplying them directly loses precision on small rooms
+        x = xs - np.repeat(xs[starts], sizes)
+        y = ys - np.repeat(ys[starts], sizes)
+        cross = x * y[following] - x[following] * y
+        polygon_areas = np.abs(np.add.reduceat(cross, starts)) / 2.0
+        polygon_areas[sizes < 3] = 0.0
+
+        mean_x = np.add.reduceat(xs, starts) / sizes
+        mean_y = np.add.reduceat(ys, starts) / sizes
+
+        for i, area, cx, cy in zip(filled.tolist(), polygon_areas.tolist(), mean_x.tolist(), mean_y.tolist()):
+            areas[i] = area
+            centroids[i] = (round(cx, 2), round(cy, 2))
+
+        return areas, centroids
+
+
+def _file_size(path: str) -> int:
+    """Size of a file in bytes, 0 if it can't be read (reported later as unreadable)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _validate_dxf_in_worker(dxf_path: str, filename: str) -> CADValidationResult:
+    """Validate one DXF file in a worker process (see validate_files)."""
+    result = CADValidationResult(filename=filename)
+    CAFMBasisplanValidator()._validate_dxf_file(dxf_path, result)
+    return result
 
 
 def get_bbl_layer_requirements() -> Dict[str, Any]:
@@ -3,15 +3,15 @@ Base classes for the GeoDataCheck validation framework.
 
 To create a new validation rule:
 1. Create a class that inherits from BaseRule
-2. Implement the metadata property with RuleMetadata
+2. Set the metadata class attribute to a RuleMetadata
 3. Implement the validate() method
 4. Register the rule in the registry
 """
 
-from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Any, Dict
+from typing import Callable, ClassVar, Iterator, List, Optional, Any, Dict, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -31,7 +31,7 @@ class Category(Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationError:
     """Represents a single validation error/warning."""
     row_index: int
@@ -88,7 +88,51 @@ class RuleMetadata:
         }
 
 
-class BaseRule(ABC):
+def available_column_names(columns: Dict[str, str], df_columns: frozenset) -> frozenset:
+    """
+    Names a rule can require that resolve to an existing column.
+
+    A mapped logical name counts if its target column exists; an unmapped
+    name counts if a column of that exact name exists.
+    """
+    mapped = {logical for logical, col in columns.items() if col in df_columns}
+    unmapped = {col for col in df_columns if col not in columns}
+    return frozenset(mapped | unmapped)
+
+
+def build_column_lookup(columns) -> Dict[str, str]:
+    """
+    Map lower-cased column names to the actual names.
+
+    If several columns differ only in case, the first one wins.
+    """
+    return {col.lower(): col for col in reversed(list(columns)) if isinstance(col, str)}
+
+
+# Text columns for the vectorized checks. Arrow-backed, so strip/contains/regex
+# run as Arrow kernels on pandas 2 as well (where plain 'string' is Python-backed)
+TEXT_DTYPE = pd.StringDtype('pyarrow')
+
+
+def stripped_strings(series: pd.Series) -> pd.Series:
+    """
+    Column-wise ``str(value).strip()``.
+
+    Missing values become '', so ``== ''`` selects missing and blank cells alike.
+    """
+    return series.astype(TEXT_DTYPE).str.strip().fillna('')
+
+
+def flagged_rows(df: pd.DataFrame, mask, *columns: str) -> Iterator[Tuple[Any, ...]]:
+    """Yield (row index, *original values) for the rows where mask is True, in row order."""
+    positions = np.flatnonzero(mask)
+    return zip(
+        df.index[positions].tolist(),
+        *(df[column].iloc[positions].tolist() for column in columns),
+    )
+
+
+class BaseRule:
     """
     Base class for all validation rules.
 
@@ -96,18 +140,16 @@ class BaseRule(ABC):
 
     ```python
     class MyRule(BaseRule):
-        @property
-        def metadata(self) -> RuleMetadata:
-            return RuleMetadata(
-                id="R-XXX-01",
-                name="My Rule",
-                name_de="Meine Regel",
-                description="What this rule checks",
-                description_de="Was diese Regel prüft",
-                category=Category.GENERAL,
-                severity=Severity.ERROR,
-                required_columns=['column_name'],
-            )
+        metadata = RuleMetadata(
+            id="R-XXX-01",
+            name="My Rule",
+            name_de="Meine Regel",
+            description="What this rule checks",
+            description_de="Was diese Regel prüft",
+            category=Category.GENERAL,
+            severity=Severity.ERROR,
+            required_columns=['column_name'],
+        )
 
         def validate(self, df: pd.DataFrame, config: dict) -> List[ValidationError]:
             errors = []
@@ -116,13 +158,15 @@ class BaseRule(ABC):
     ```
     """
 
-    @property
-    @abstractmethod
-    def metadata(self) -> RuleMetadata:
-        """Return rule metadata for documentation and UI."""
-        pass
+    # Rule metadata for documentation and UI. A plain class attribute, built
+    # once at class definition, because rules read it for every error.
+    metadata: ClassVar[RuleMetadata]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not isinstance(getattr(cls, 'metadata', None), RuleMetadata):
+            raise TypeError(f"{cls.__name__} must define a 'metadata' RuleMetadata class attribute")
 
-    @abstractmethod
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         """
         Validate the dataframe and return list of errors.
@@ -136,7 +180,7 @@ class BaseRule(ABC):
         Returns:
             List of ValidationError objects
         """
-        pass
+        raise NotImplementedError
 
     def is_applicable(self, df: pd.DataFrame, config: Dict[str, Any]) -> bool:
         """
@@ -144,12 +188,20 @@ class BaseRule(ABC):
 
         Override this method for custom applicability logic.
         """
+        required_columns = self.metadata.required_columns
+        if not required_columns:
+            return True
+
+        # Names that resolve to a column, built once per run by ValidationEngine.validate()
+        available = config.get('_available_columns')
+        if available is not None:
+            return available.issuperset(required_columns)
+
         columns = config.get('columns', {})
-        for required in self.metadata.required_columns:
-            actual_col = columns.get(required, required)
-            if actual_col not in df.columns:
-                return False
-        return True
+        df_columns = config.get('_df_columns')
+        if df_columns is None:
+            df_columns = frozenset(df.columns)
+        return all(columns.get(required, required) in df_columns for required in required_columns)
 
     def get_column(self, df: pd.DataFrame, config: Dict[str, Any], logical_name: str) -> Optional[str]:
         """
@@ -165,10 +217,29 @@ class BaseRule(ABC):
         """
         columns = config.get('columns', {})
         actual_col = columns.get(logical_name, logical_name)
-        if actual_col in df.columns:
+        df_columns = config.get('_df_columns')
+        if actual_col in (df.columns if df_columns is None else df_columns):
             return actual_col
-        # Try case-insensitive match
-        for col in df.columns:
-            if col.lower() == actual_col.lower():
-                return col
-        return None
+        if not isinstance(actual_col, str):
+            return None
+        # Try case-insensitive match (lookup built once per run by the engine)
+        column_lookup = config.get('_df_column_lookup')
+        if column_lookup is None:
+            column_lookup = build_column_lookup(df.columns)
+        return column_lookup.get(actual_col.lower())
+
+    def derived_column(self, df: pd.DataFrame, config: Dict[str, Any], column: str, transform: Callable):
+        """
+        Return transform(df[column]), computed once per validation run.
+
+        Several rules read the same columns (e.g. stripped PLZ strings, parsed
+        coordinates), so the engine provides a per-run cache in the config.
+        The result is shared between rules and must not be modified.
+        """
+        cache = config.get('_column_cache')
+        if cache is None:
+            return transform(df[column])
+        key = (transform, column)
+        if key not in cache:
+            cache[key] = transform(df[column])
+        return cache[key]
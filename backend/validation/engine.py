@@ -2,12 +2,48 @@
 Validation engine - orchestrates rule execution and aggregates results.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field
+import numpy as np
 import pandas as pd
-from collections import defaultdict
-
-from .base import BaseRule, ValidationError, Category, Severity, RuleMetadata
+from collections import Counter, defaultdict
+from operator import attrgetter
+
+from .base import (
+    BaseRule, ValidationError, Category, Severity, RuleMetadata,
+    TEXT_DTYPE, available_column_names, build_column_lookup,
+)
+
+
+# Rule ID prefix -> category (e.g., R-ADDR-01 -> address)
+RULE_ID_CATEGORIES = {
+    'ADDR': 'address', 'COORD': 'coordinates',
+    'EGID': 'egid', 'GEN': 'general', 'CUSTOM': 'custom',
+}
+
+# Common column names (lower case) per logical column, in order of preference
+COLUMN_PATTERNS = {
+    'plz': ['plz', 'postleitzahl', 'postal_code', 'zip', 'npa'],
+    'ort': ['ort', 'stadt', 'gemeinde', 'city', 'town', 'locality', 'ortschaft'],
+    'strasse': ['strasse', 'street', 'adresse', 'address', 'str', 'rue'],
+    'hausnummer': ['hausnummer', 'hausnr', 'nr', 'number', 'no'],
+    'kanton': ['kanton', 'kt', 'canton', 'state', 'ct'],
+    'egid': ['egid', 'gebäude_id', 'building_id', 'geb_id', 'egid_edid'],
+    'ewid': ['ewid', 'wohnung_id', 'dwelling_id'],
+    'easting': ['e', 'e_coord', 'x', 'x_coord', 'easting', 'lon', 'longitude', 'e_lv95', 'koordinate_e'],
+    'northing': ['n', 'n_coord', 'y', 'y_coord', 'northing', 'lat', 'latitude', 'n_lv95', 'koordinate_n'],
+    'region': ['region', 'gebiet', 'zone', 'area'],
+    'portfolio': ['portfolio', 'portfolio_typ', 'kategorie', 'type', 'asset_type', 'objekttyp'],
+    'responsible': ['verantwortlich', 'zuständig', 'owner', 'responsible', 'bearbeiter', 'sachbearbeiter'],
+}
+
+# Column name -> (logical name, preference rank), for one lookup per column
+_COLUMN_NAME_LOOKUP = {
+    name: (logical_name, rank)
+    for logical_name, names in COLUMN_PATTERNS.items()
+    for rank, name in enumerate(names)
+}
 
 
 class RuleRegistry:
@@ -15,10 +51,16 @@ class RuleRegistry:
 
     def __init__(self):
         self._rules: Dict[str, BaseRule] = {}
+        self._rules_by_category: Dict[Category, Dict[str, BaseRule]] = defaultdict(dict)
 
     def register(self, rule: BaseRule) -> None:
         """Register a rule instance."""
-        self._rules[rule.metadata.id] = rule
+        metadata = rule.metadata
+        previous = self._rules.get(metadata.id)
+        if previous is not None and previous.metadata.category != metadata.category:
+            self._rules_by_category[previous.metadata.category].pop(metadata.id, None)
+        self._rules[metadata.id] = rule
+        self._rules_by_category[metadata.category][metadata.id] = rule
 
     def get_rule(self, rule_id: str) -> Optional[BaseRule]:
         """Get a specific rule by ID."""
@@ -30,8 +72,7 @@ class RuleRegistry:
 
     def get_rules_by_category(self, category: Category) -> List[BaseRule]:
         """Get all rules in a category."""
-        return [r for r in self._rules.values()
-                if r.metadata.category == category]
+        return list(self._rules_by_category.get(category, {}).values())
 
     def get_rule_ids(self) -> List[str]:
         """Get all rule IDs."""
@@ -45,50 +86,98 @@ class RuleRegistry:
         ]
 
 
-@dataclass
 class ValidationResult:
     """Complete result of a validation run."""
-    total_rows: int
-    errors: List[ValidationError] = field(default_factory=list)
-    rules_executed: List[str] = field(default_factory=list)
-    rules_skipped: List[str] = field(default_factory=list)
+
+    __slots__ = ('total_rows', '_errors', 'rules_executed', 'rules_skipped', '_stats')
+
+    def __init__(
+        self,
+        total_rows: int,
+        errors: Optional[List[ValidationError]] = None,
+        rules_executed: Optional[List[str]] = None,
+        rules_skipped: Optional[List[str]] = None,
+    ):
+        self.total_rows = total_rows
+        self._errors = errors if errors is not None else []
+        self.rules_executed = rules_executed if rules_executed is not None else []
+        self.rules_skipped = rules_skipped if rules_skipped is not None else []
+        # Counts over errors, see _compute_stats(); None = needs recounting
+        self._stats: Optional[Dict[str, Any]] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationResult(total_rows={self.total_rows}, errors={len(self._errors)}, "
+            f"rules_executed={self.rules_executed}, rules_skipped={self.rules_skipped})"
+        )
+
+    @property
+    def errors(self) -> List[ValidationError]:
+        # The caller may change the list in place, so the counts are redone
+        self._stats = None
+        return self._errors
+
+    @errors.setter
+    def errors(self, errors: List[ValidationError]) -> None:
+        self._errors = errors
+        self._stats = None
+
+    def add_error(self, error: ValidationError) -> None:
+        self._errors.append(error)
+        self._stats = None
+
+    def _compute_stats(self) -> Dict[str, Any]:
+        """
+        Count errors per severity and per rule, and failed rows.
+
+        The result is cached until errors are added, replaced or handed out
+        through the errors property.
+        """
+        if self._stats is None:
+            errors = self._errors
+            # Counter over attrgetter keeps the counting loops in C
+            severities = Counter(map(attrgetter('severity'), errors))
+            error_rows = {e.row_index for e in errors if e.severity == Severity.ERROR}
+            self._stats = {
+                'error_count': severities[Severity.ERROR],
+                'warning_count': severities[Severity.WARNING],
+                'info_count': severities[Severity.INFO],
+                'error_rows': len(error_rows),
+                'by_rule': Counter(map(attrgetter('rule_id'), errors)),
+            }
+        return self._stats
 
     @property
     def error_count(self) -> int:
-        return sum(1 for e in self.errors if e.severity == Severity.ERROR)
+        return self._compute_stats()['error_count']
 
     @property
     def warning_count(self) -> int:
-        return sum(1 for e in self.errors if e.severity == Severity.WARNING)
+        return self._compute_stats()['warning_count']
 
     @property
     def info_count(self) -> int:
-        return sum(1 for e in self.errors if e.severity == Severity.INFO)
+        return self._compute_stats()['info_count']
 
     @property
     def passed_rows(self) -> int:
-        error_rows = set(e.row_index for e in self.errors if e.severity == Severity.ERROR)
-        return self.total_rows - len(error_rows)
+        return self.total_rows - self._compute_stats()['error_rows']
 
     def get_errors_by_category(self) -> Dict[str, int]:
         """Group error counts by rule category."""
         counts = defaultdict(int)
-        for e in self.errors:
+        # Per-rule counts first, so each distinct rule_id is split only once
+        for rule_id, count in self.get_errors_by_rule().items():
             # Extract category from rule_id (e.g., R-ADDR-01 -> ADDRESS)
-            parts = e.rule_id.split('-')
+            parts = rule_id.split('-')
             if len(parts) >= 2:
-                cat_map = {'ADDR': 'address', 'COORD': 'coordinates',
-                          'EGID': 'egid', 'GEN': 'general', 'CUSTOM': 'custom'}
-                cat = cat_map.get(parts[1], 'general')
-                counts[cat] += 1
+                cat = RULE_ID_CATEGORIES.get(parts[1], 'general')
+                counts[cat] += count
         return dict(counts)
 
     def get_errors_by_rule(self) -> Dict[str, int]:
         """Group error counts by rule."""
-        counts = defaultdict(int)
-        for e in self.errors:
-            counts[e.rule_id] += 1
-        return dict(counts)
+        return dict(self._compute_stats()['by_rule'])
 
     def get_errors_by_dimension(self, df: pd.DataFrame, dimension_col: str) -> Dict[str, Dict[str, int]]:
         """
@@ -103,24 +192,33 @@ class ValidationResult:
         if dimension_col not in df.columns:
             return {}
 
-        result = defaultdict(lambda: {'total': 0, 'errors': 0, 'warnings': 0})
+        # One dimension label per row, in row order. Text columns convert as a
+        # whole; other values are labelled with str() as before (e.g. dates as
+        # '2024-01-01 00:00:00', which the string dtype would shorten)
+        column = df[dimension_col]
+        if isinstance(column.dtype, pd.StringDtype):
+            labels = column.astype(TEXT_DTYPE)
+        else:
+            labels = column.map(str, na_action='ignore').astype(object)
+        dims = labels.fillna('(leer)').to_numpy(dtype=object)
 
-        # Count total rows per dimension
-        for idx, row in df.iterrows():
-            dim_value = str(row[dimension_col]) if pd.notna(row[dimension_col]) else '(leer)'
-            result[dim_value]['total'] += 1
+        # Count total rows per dimension (sort=False keeps first-appearance order)
+        result = {
+            dim_value: {'total': int(total), 'errors': 0, 'warnings': 0}
+            for dim_value, total in pd.Series(dims).value_counts(sort=False).items()
+        }
 
         # Count errors per dimension
-        for error in self.errors:
-            if error.row_index < len(df):
-                dim_value = df.iloc[error.row_index][dimension_col]
-                dim_value = str(dim_value) if pd.notna(dim_value) else '(leer)'
-                if error.severity == Severity.ERROR:
-                    result[dim_value]['errors'] += 1
-                elif error.severity == Severity.WARNING:
-                    result[dim_value]['warnings'] += 1
+        n_errors = len(self._errors)
+        positions = np.fromiter((e.row_index for e in self._errors), dtype=np.int64, count=n_errors)
+        severities = np.fromiter((e.severity.value for e in self._errors), dtype=object, count=n_errors)
+        in_frame = positions < len(df)
+        for key, severity in (('errors', Severity.ERROR), ('warnings', Severity.WARNING)):
+            error_dims = dims[positions[in_frame & (severities == severity.value)]]
+            for dim_value, count in pd.Series(error_dims, dtype=object).value_counts(sort=False).items():
+                result[dim_value][key] = int(count)
 
-        return dict(result)
+        return result
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -131,7 +229,7 @@ class ValidationResult:
             'info_count': self.info_count,
             'passed_rows': self.passed_rows,
             'pass_rate': round(self.passed_rows / self.total_rows * 100, 1) if self.total_rows > 0 else 100,
-            'errors': [e.to_dict() for e in self.errors],
+            'errors': [e.to_dict() for e in self._errors],
             'errors_by_category': self.get_errors_by_category(),
             'errors_by_rule': self.get_errors_by_rule(),
             'rules_executed': self.rules_executed,
@@ -152,8 +250,11 @@ class ValidationEngine:
         result = engine.validate(df, config)
     """
 
-    def __init__(self, registry: RuleRegistry):
+    def __init__(self, registry: RuleRegistry, max_workers: int = 1):
         self.registry = registry
+        # Rules are independent of each other; with max_workers > 1 they run
+        # in a thread pool (worthwhile only with several cores)
+        self.max_workers = max_workers
 
     def validate(
         self,
@@ -174,6 +275,19 @@ class ValidationEngine:
         """
         result = ValidationResult(total_rows=len(df))
 
+        # Every rule looks up its columns, so index the column names once per run
+        # (shallow copy: the caller's config is left untouched)
+        df_columns = frozenset(df.columns)
+        config = {
+            **config,
+            '_df_columns': df_columns,
+            '_df_column_lookup': build_column_lookup(df.columns),
+            # Lets is_applicable() check required columns with one set test
+            '_available_columns': available_column_names(config.get('columns', {}), df_columns),
+            # Derived column data shared between rules, see BaseRule.derived_column()
+            '_column_cache': {},
+        }
+
         # Get rules to execute
         if rule_ids:
             rules = [self.registry.get_rule(rid) for rid in rule_ids]
@@ -181,50 +295,61 @@ class ValidationEngine:
         else:
             rules = self.registry.get_all_rules()
 
-        # Execute each rule
-        for rule in rules:
-            if rule.is_applicable(df, config):
-                try:
-                    errors = rule.validate(df, config)
-                    result.errors.extend(errors)
-                    result.rules_executed.append(rule.metadata.id)
-                except Exception as e:
-                    # Log error but continue with other rules
-                    print(f"Error executing rule {rule.metadata.id}: {e}")
-                    result.rules_skipped.append(rule.metadata.id)
-            else:
+        # Execute each applicable rule
+        applicable = [rule.is_applicable(df, config) for rule in rules]
+        to_run = [rule for rule, ok in zip(rules, applicable) if ok]
+        if self.max_workers > 1 and len(to_run) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(to_run))) as pool:
+                outcomes = list(pool.map(lambda rule: self._run_rule(rule, df, config), to_run))
+        else:
+            outcomes = [self._run_rule(rule, df, config) for rule in to_run]
+
+        # Collect in rule order, whatever order the rules finished in
+        per_rule: List[List[ValidationError]] = []
+        outcomes = iter(outcomes)
+        for rule, ok in zip(rules, applicable):
+            errors = next(outcomes) if ok else None
+            if errors is None:
                 result.rules_skipped.append(rule.metadata.id)
+            else:
+                per_rule.append(errors)
+                result.rules_executed.append(rule.metadata.id)
+
+        # Assemble the error list once instead of growing it rule by rule
+        result.errors = list(chain.from_iterable(per_rule))
 
         return result
 
+    @staticmethod
+    def _run_rule(rule: BaseRule, df: pd.DataFrame, config: Dict[str, Any]) -> Optional[List[ValidationError]]:
+        """Run one rule, returning None if it raised."""
+        try:
+            return rule.validate(df, config)
+        except Exception as e:
+            # Log error but continue with other rules
+            print(f"Error executing rule {rule.metadata.id}: {e}")
+            return None
+
     def detect_columns(self, df: pd.DataFrame) -> Dict[str, str]:
         """
         Auto-detect column mappings based on common naming patterns.
 
         Returns dict mapping logical names to detected column names.
         """
-        patterns = {
-            'plz': ['plz', 'postleitzahl', 'postal_code', 'zip', 'npa'],
-            'ort': ['ort', 'stadt', 'gemeinde', 'city', 'town', 'locality', 'ortschaft'],
-            'strasse': ['strasse', 'street', 'adresse', 'address', 'str', 'rue'],
-            'hausnummer': ['hausnummer', 'hausnr', 'nr', 'number', 'no'],
-            'kanton': ['kanton', 'kt', 'canton', 'state', 'ct'],
-            'egid': ['egid', 'gebäude_id', 'building_id', 'geb_id', 'egid_edid'],
-            'ewid': ['ewid', 'wohnung_id', 'dwelling_id'],
-            'easting': ['e', 'e_coord', 'x', 'x_coord', 'easting', 'lon', 'longitude', 'e_lv95', 'koordinate_e'],
-            'northing': ['n', 'n_coord', 'y', 'y_coord', 'northing', 'lat', 'latitude', 'n_lv95', 'koordinate_n'],
-            'region': ['region', 'gebiet', 'zone', 'area'],
-            'portfolio': ['portfolio', 'portfolio_typ', 'kategorie', 'type', 'asset_type', 'objekttyp'],
-            'responsible': ['verantwortlich', 'zuständig', 'owner', 'responsible', 'bearbeiter', 'sachbearbeiter'],
-        }
-
-        detected = {}
+        # Best (lowest rank) match per logical name
+        matches: Dict[str, tuple] = {}
         df_cols_lower = {col.lower(): col for col in df.columns}
 
-        for logical_name, possible_names in patterns.items():
-            for name in possible_names:
-                if name in df_cols_lower:
-                    detected[logical_name] = df_cols_lower[name]
-                    break
+        for name, col in df_cols_lower.items():
+            match = _COLUMN_NAME_LOOKUP.get(name)
+            if match is None:
+                continue
+            logical_name, rank = match
+            if logical_name not in matches or rank < matches[logical_name][0]:
+                matches[logical_name] = (rank, col)
 
-        return detected
+        return {
+            logical_name: matches[logical_name][1]
+            for logical_name in COLUMN_PATTERNS
+            if logical_name in matches
+        }
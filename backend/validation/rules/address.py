@@ -3,40 +3,56 @@ Address validation rules for Swiss addresses.
 """
 
 from typing import List, Dict, Any
+import numpy as np
 import pandas as pd
 import re
 
-from ..base import BaseRule, RuleMetadata, ValidationError, Category, Severity
+from ..base import (
+    BaseRule, RuleMetadata, ValidationError, Category, Severity,
+    flagged_rows, stripped_strings,
+)
 
 
 # Valid Swiss canton abbreviations
-SWISS_CANTONS = {
+SWISS_CANTONS = frozenset({
     'AG', 'AI', 'AR', 'BE', 'BL', 'BS', 'FR', 'GE', 'GL', 'GR',
     'JU', 'LU', 'NE', 'NW', 'OW', 'SG', 'SH', 'SO', 'SZ', 'TG',
     'TI', 'UR', 'VD', 'VS', 'ZG', 'ZH'
-}
+})
+
+CANTON_SUGGESTION = f"Gültige Kantone: {', '.join(sorted(SWISS_CANTONS))}"
+
+# Special characters that shouldn't appear in street names
+STREET_INVALID_CHARS = re.compile(r'[<>{}|\\^~\[\]]')
+
+
+def _float_to_plz_string(plz_str: str) -> str:
+    """Turn float-formatted values like '8001.0' back into '8001'."""
+    try:
+        return str(int(float(plz_str)))
+    except (ValueError, OverflowError):
+        return plz_str
 
 
 class RequiredFieldsRule(BaseRule):
     """Checks that required address fields are present."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-ADDR-01",
-            name="Required Fields",
-            name_de="Pflichtfelder",
-            description="Checks that essential address fields (street, PLZ, city) are not empty",
-            description_de="Prüft, ob wesentliche Adressfelder (Strasse, PLZ, Ort) ausgefüllt sind",
-            category=Category.ADDRESS,
-            severity=Severity.ERROR,
-            required_columns=[],  # Dynamic based on config
-            example_valid="Bundesplatz 1, 3003, Bern",
-            example_invalid="Bundesplatz 1, , (PLZ und Ort fehlen)",
-        )
+    metadata = RuleMetadata(
+        id="R-ADDR-01",
+        name="Required Fields",
+        name_de="Pflichtfelder",
+        description="Checks that essential address fields (street, PLZ, city) are not empty",
+        description_de="Prüft, ob wesentliche Adressfelder (Strasse, PLZ, Ort) ausgefüllt sind",
+        category=Category.ADDRESS,
+        severity=Severity.ERROR,
+        required_columns=[],  # Dynamic based on config
+        example_valid="Bundesplatz 1, 3003, Bern",
+        example_invalid="Bundesplatz 1, , (PLZ und Ort fehlen)",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         columns = config.get('columns', {})
 
         # Check each required field
@@ -51,18 +67,19 @@ class RequiredFieldsRule(BaseRule):
             if col is None:
                 continue  # Column not mapped, skip
 
-            for idx, row in df.iterrows():
-                value = row[col]
-                if pd.isna(value) or str(value).strip() == '':
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"{display_name} fehlt oder ist leer",
-                        value=value,
-                    ))
+            empty = (self.derived_column(df, config, col, stripped_strings) == '').to_numpy(dtype=bool)
+            errors.extend(
+                ValidationError(
+                    row_index=idx,
+                    column=col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=f"{display_name} fehlt oder ist leer",
+                    value=value,
+                )
+                for idx, value in flagged_rows(df, empty, col)
+            )
 
         return errors
 
@@ -70,74 +87,60 @@ class RequiredFieldsRule(BaseRule):
 class PLZFormatRule(BaseRule):
     """Validates Swiss postal code format."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-ADDR-02",
-            name="PLZ Format",
-            name_de="PLZ-Format",
-            description="Swiss postal codes must be 4 digits between 1000 and 9999",
-            description_de="Schweizer Postleitzahlen müssen 4-stellig sein (1000-9999)",
-            category=Category.ADDRESS,
-            severity=Severity.ERROR,
-            required_columns=['plz'],
-            example_valid="8001",
-            example_invalid="123, 00100, 8001a",
-        )
+    metadata = RuleMetadata(
+        id="R-ADDR-02",
+        name="PLZ Format",
+        name_de="PLZ-Format",
+        description="Swiss postal codes must be 4 digits between 1000 and 9999",
+        description_de="Schweizer Postleitzahlen müssen 4-stellig sein (1000-9999)",
+        category=Category.ADDRESS,
+        severity=Severity.ERROR,
+        required_columns=['plz'],
+        example_valid="8001",
+        example_invalid="123, 00100, 8001a",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         plz_col = self.get_column(df, config, 'plz')
 
         if plz_col is None:
             return errors
 
-        for idx, row in df.iterrows():
-            value = row[plz_col]
-
-            if pd.isna(value) or str(value).strip() == '':
-                continue  # Handled by required fields rule
-
-            # Convert to string and clean
-            plz_str = str(value).strip()
-
-            # Handle float values like 8001.0
-            if '.' in plz_str:
-                try:
-                    plz_str = str(int(float(plz_str)))
-                except ValueError:
-                    pass
-
-            if not plz_str.isdigit():
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=plz_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
-                    message=f"PLZ muss numerisch sein: '{value}'",
-                    value=value,
-                ))
-            elif len(plz_str) != 4:
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=plz_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
-                    message=f"PLZ muss 4-stellig sein: '{value}' ({len(plz_str)} Stellen)",
-                    value=value,
-                ))
-            elif not (1000 <= int(plz_str) <= 9999):
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=plz_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
-                    message=f"PLZ ausserhalb gültiger Bereich: '{value}' (muss 1000-9999 sein)",
-                    value=value,
-                ))
+        # Convert to string and clean; empty cells are handled by required fields rule
+        plz = self.derived_column(df, config, plz_col, stripped_strings)
+        present = (plz != '').to_numpy(dtype=bool)
+
+        # Handle float values like 8001.0
+        has_dot = plz.str.contains('.', regex=False).to_numpy(dtype=bool)
+        if has_dot.any():
+            plz = plz.copy()
+            plz[has_dot] = plz[has_dot].map(_float_to_plz_string)
+
+        numeric = plz.str.isdigit().to_numpy(dtype=bool)
+        lengths = plz.str.len().to_numpy(dtype=np.int64)
+        # A 4-digit PLZ is below 1000 only with a leading zero
+        leading_zero = plz.str.startswith('0').to_numpy(dtype=bool)
+        invalid = present & ~(numeric & (lengths == 4) & ~leading_zero)
+
+        rows = flagged_rows(df, invalid, plz_col)
+        for (idx, value), is_numeric, length in zip(rows, numeric[invalid], lengths[invalid]):
+            if not is_numeric:
+                message = f"PLZ muss numerisch sein: '{value}'"
+            elif length != 4:
+                message = f"PLZ muss 4-stellig sein: '{value}' ({length} Stellen)"
+            else:
+                message = f"PLZ ausserhalb gültiger Bereich: '{value}' (muss 1000-9999 sein)"
+            errors.append(ValidationError(
+                row_index=idx,
+                column=plz_col,
+                rule_id=rule_id,
+                rule_name=rule_name,
+                severity=severity,
+                message=message,
+                value=value,
+            ))
 
         return errors
 
@@ -145,47 +148,44 @@ class PLZFormatRule(BaseRule):
 class CantonValidationRule(BaseRule):
     """Validates Swiss canton abbreviations."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-ADDR-04",
-            name="Canton Validation",
-            name_de="Kanton-Validierung",
-            description="Canton abbreviation must be a valid Swiss canton (AG, BE, ZH, etc.)",
-            description_de="Kantonsabkürzung muss ein gültiger Schweizer Kanton sein (AG, BE, ZH, etc.)",
-            category=Category.ADDRESS,
-            severity=Severity.ERROR,
-            required_columns=['kanton'],
-            example_valid="ZH, BE, VD",
-            example_invalid="XX, Switzerland, Zürich",
-        )
+    metadata = RuleMetadata(
+        id="R-ADDR-04",
+        name="Canton Validation",
+        name_de="Kanton-Validierung",
+        description="Canton abbreviation must be a valid Swiss canton (AG, BE, ZH, etc.)",
+        description_de="Kantonsabkürzung muss ein gültiger Schweizer Kanton sein (AG, BE, ZH, etc.)",
+        category=Category.ADDRESS,
+        severity=Severity.ERROR,
+        required_columns=['kanton'],
+        example_valid="ZH, BE, VD",
+        example_invalid="XX, Switzerland, Zürich",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         kanton_col = self.get_column(df, config, 'kanton')
 
         if kanton_col is None:
             return errors
 
-        for idx, row in df.iterrows():
-            value = row[kanton_col]
-
-            if pd.isna(value) or str(value).strip() == '':
-                continue  # Optional field
-
-            kanton = str(value).strip().upper()
-
-            if kanton not in SWISS_CANTONS:
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=kanton_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
-                    message=f"Ungültige Kantonsabkürzung: '{value}'",
-                    value=value,
-                    suggestion=f"Gültige Kantone: {', '.join(sorted(SWISS_CANTONS))}",
-                ))
+        # Empty cells are fine (optional field)
+        kanton = self.derived_column(df, config, kanton_col, stripped_strings).str.upper()
+        invalid = ((kanton != '') & ~kanton.isin(SWISS_CANTONS)).to_numpy(dtype=bool)
+
+        errors.extend(
+            ValidationError(
+                row_index=idx,
+                column=kanton_col,
+                rule_id=rule_id,
+                rule_name=rule_name,
+                severity=severity,
+                message=f"Ungültige Kantonsabkürzung: '{value}'",
+                value=value,
+                suggestion=CANTON_SUGGESTION,
+            )
+            for idx, value in flagged_rows(df, invalid, kanton_col)
+        )
 
         return errors
 
@@ -193,70 +193,57 @@ class CantonValidationRule(BaseRule):
 class StreetFormatRule(BaseRule):
     """Checks street name format for obvious issues."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-ADDR-05",
-            name="Street Format",
-            name_de="Strassenformat",
-            description="Checks street names for obvious formatting issues",
-            description_de="Prüft Strassennamen auf offensichtliche Formatierungsfehler",
-            category=Category.ADDRESS,
-            severity=Severity.WARNING,
-            required_columns=['strasse'],
-            example_valid="Bundesplatz 1, Bahnhofstrasse 23a",
-            example_invalid="123456, ????",
-        )
+    metadata = RuleMetadata(
+        id="R-ADDR-05",
+        name="Street Format",
+        name_de="Strassenformat",
+        description="Checks street names for obvious formatting issues",
+        description_de="Prüft Strassennamen auf offensichtliche Formatierungsfehler",
+        category=Category.ADDRESS,
+        severity=Severity.WARNING,
+        required_columns=['strasse'],
+        example_valid="Bundesplatz 1, Bahnhofstrasse 23a",
+        example_invalid="123456, ????",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name = self.metadata.id, self.metadata.name_de
         strasse_col = self.get_column(df, config, 'strasse')
 
         if strasse_col is None:
             return errors
 
-        for idx, row in df.iterrows():
-            value = row[strasse_col]
-
-            if pd.isna(value) or str(value).strip() == '':
-                continue
-
-            strasse = str(value).strip()
-
-            # Check for all-numeric (likely wrong column)
-            if strasse.isdigit():
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=strasse_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=Severity.WARNING,
-                    message=f"Strasse ist nur numerisch: '{value}'",
-                    value=value,
-                ))
-
-            # Check for very short names (likely incomplete)
-            elif len(strasse) < 3:
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=strasse_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=Severity.WARNING,
-                    message=f"Strassenname sehr kurz: '{value}'",
-                    value=value,
-                ))
-
-            # Check for special characters that shouldn't be there
-            elif re.search(r'[<>{}|\\^~\[\]]', strasse):
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=strasse_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=Severity.WARNING,
-                    message=f"Strassenname enthält ungewöhnliche Zeichen: '{value}'",
-                    value=value,
-                ))
+        strasse = self.derived_column(df, config, strasse_col, stripped_strings)
+        present = (strasse != '').to_numpy(dtype=bool)
+
+        # All-numeric (likely wrong column)
+        numeric = present & strasse.str.isdigit().to_numpy(dtype=bool)
+        # Very short names (likely incomplete)
+        short = present & ~numeric & (strasse.str.len() < 3).to_numpy(dtype=bool)
+        # Special characters that shouldn't be there
+        special = (
+            present & ~numeric & ~short
+            & strasse.str.contains(STREET_INVALID_CHARS).to_numpy(dtype=bool)
+        )
+        flagged = numeric | short | special
+
+        rows = flagged_rows(df, flagged, strasse_col)
+        for (idx, value), is_numeric, is_short in zip(rows, numeric[flagged], short[flagged]):
+            if is_numeric:
+                message = f"Strasse ist nur numerisch: '{value}'"
+            elif is_short:
+                message = f"Strassenname sehr kurz: '{value}'"
+            else:
+                message = f"Strassenname enthält ungewöhnliche Zeichen: '{value}'"
+            errors.append(ValidationError(
+                row_index=idx,
+                column=strasse_col,
+                rule_id=rule_id,
+                rule_name=rule_name,
+                severity=Severity.WARNING,
+                message=message,
+                value=value,
+            ))
 
         return errors
@@ -3,10 +3,15 @@ Coordinate validation rules for Swiss coordinate systems (LV95, WGS84).
 """
 
 from typing import List, Dict, Any, Tuple, Optional
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_timedelta64_dtype
 import math
 
-from ..base import BaseRule, RuleMetadata, ValidationError, Category, Severity
+from ..base import (
+    BaseRule, RuleMetadata, ValidationError, Category, Severity,
+    flagged_rows, stripped_strings,
+)
 
 
 # Switzerland bounds
@@ -38,56 +43,94 @@ def detect_coordinate_system(e: float, n: float) -> Optional[str]:
     return None
 
 
+def detect_coordinate_systems(e: np.ndarray, n: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column-wise detect_coordinate_system().
+
+    Returns boolean masks (is_lv95, is_wgs84); rows in neither are unclear.
+    """
+    is_lv95 = (2000000 < e) & (e < 3000000) & (1000000 < n) & (n < 2000000)
+    is_wgs84 = ~is_lv95 & (5 < e) & (e < 11) & (45 < n) & (n < 48)
+    return is_lv95, is_wgs84
+
+
+def parse_coordinates(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column-wise float(value).
+
+    Returns (values, parsed): values is NaN where the cell is missing or not a
+    number, parsed is False there (missing cells are not parsed either).
+    """
+    # to_numeric() turns dates and durations into epoch numbers; float() rejects them
+    if is_datetime64_any_dtype(series) or is_timedelta64_dtype(series):
+        return np.full(len(series), np.nan), np.zeros(len(series), dtype=bool)
+
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan, copy=True)
+    parsed = ~np.isnan(values)
+
+    # to_numeric() is stricter than float() (e.g. 'nan', '1_000'); retry those cells
+    retry = np.flatnonzero(~parsed & series.notna().to_numpy())
+    if len(retry):
+        raw = series.to_numpy()
+        for pos in retry:
+            try:
+                value = float(raw[pos])
+            except (ValueError, TypeError):
+                continue
+            values[pos] = value
+            parsed[pos] = True
+
+    return values, parsed
+
+
 class CoordinatePresenceRule(BaseRule):
     """Checks that coordinates are provided."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-COORD-01",
-            name="Coordinate Presence",
-            name_de="Koordinaten vorhanden",
-            description="Checks that both E and N coordinates are provided",
-            description_de="Prüft, ob E- und N-Koordinaten vorhanden sind",
-            category=Category.COORDINATES,
-            severity=Severity.WARNING,
-            required_columns=['easting', 'northing'],
-            example_valid="E: 2600000, N: 1200000",
-            example_invalid="E: 2600000, N: (leer)",
-        )
+    metadata = RuleMetadata(
+        id="R-COORD-01",
+        name="Coordinate Presence",
+        name_de="Koordinaten vorhanden",
+        description="Checks that both E and N coordinates are provided",
+        description_de="Prüft, ob E- und N-Koordinaten vorhanden sind",
+        category=Category.COORDINATES,
+        severity=Severity.WARNING,
+        required_columns=['easting', 'northing'],
+        example_valid="E: 2600000, N: 1200000",
+        example_invalid="E: 2600000, N: (leer)",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         e_col = self.get_column(df, config, 'easting')
         n_col = self.get_column(df, config, 'northing')
 
         if e_col is None or n_col is None:
             return errors
 
-        for idx, row in df.iterrows():
-            e_val = row[e_col]
-            n_val = row[n_col]
+        e_missing = (self.derived_column(df, config, e_col, stripped_strings) == '').to_numpy(dtype=bool)
+        n_missing = (self.derived_column(df, config, n_col, stripped_strings) == '').to_numpy(dtype=bool)
 
-            e_missing = pd.isna(e_val) or str(e_val).strip() == ''
-            n_missing = pd.isna(n_val) or str(n_val).strip() == ''
-
-            if e_missing and not n_missing:
+        # Exactly one of the two is missing
+        one_missing = e_missing ^ n_missing
+        for idx, only_e_missing in zip(df.index[one_missing].tolist(), e_missing[one_missing]):
+            if only_e_missing:
                 errors.append(ValidationError(
                     row_index=idx,
                     column=e_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
                     message="E-Koordinate fehlt (N-Koordinate vorhanden)",
                     value=None,
                 ))
-            elif n_missing and not e_missing:
+            else:
                 errors.append(ValidationError(
                     row_index=idx,
                     column=n_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
                     message="N-Koordinate fehlt (E-Koordinate vorhanden)",
                     value=None,
                 ))
@@ -98,23 +141,22 @@ class CoordinatePresenceRule(BaseRule):
 class SwissBoundsRule(BaseRule):
     """Validates coordinates are within Switzerland."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-COORD-02",
-            name="Swiss Bounds Check",
-            name_de="Schweizer Grenzen",
-            description="Coordinates must fall within Switzerland's boundaries",
-            description_de="Koordinaten müssen innerhalb der Schweizer Grenzen liegen",
-            category=Category.COORDINATES,
-            severity=Severity.ERROR,
-            required_columns=['easting', 'northing'],
-            example_valid="E: 2600000, N: 1200000 (Bern, LV95)",
-            example_invalid="E: 1000000, N: 500000 (ausserhalb CH)",
-        )
+    metadata = RuleMetadata(
+        id="R-COORD-02",
+        name="Swiss Bounds Check",
+        name_de="Schweizer Grenzen",
+        description="Coordinates must fall within Switzerland's boundaries",
+        description_de="Koordinaten müssen innerhalb der Schweizer Grenzen liegen",
+        category=Category.COORDINATES,
+        severity=Severity.ERROR,
+        required_columns=['easting', 'northing'],
+        example_valid="E: 2600000, N: 1200000 (Bern, LV95)",
+        example_invalid="E: 1000000, N: 500000 (ausserhalb CH)",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         e_col = self.get_column(df, config, 'easting')
         n_col = self.get_column(df, config, 'northing')
 
@@ -123,91 +165,95 @@ class SwissBoundsRule(BaseRule):
 
         coord_system = config.get('options', {}).get('coordinate_system', 'auto')
 
-        for idx, row in df.iterrows():
-            e_val = row[e_col]
-            n_val = row[n_col]
-
-            if pd.isna(e_val) or pd.isna(n_val):
-                continue
+        e_values, e_parsed = self.derived_column(df, config, e_col, parse_coordinates)
+        n_values, n_parsed = self.derived_column(df, config, n_col, parse_coordinates)
+        present = (df[e_col].notna() & df[n_col].notna()).to_numpy()
+        unparseable = present & ~(e_parsed & n_parsed)
+        checked = present & e_parsed & n_parsed
+
+        # Auto-detect coordinate system if needed
+        if coord_system == 'auto':
+            is_lv95, is_wgs84 = detect_coordinate_systems(e_values, n_values)
+            lv95 = checked & is_lv95
+            wgs84 = checked & is_wgs84
+        elif coord_system == 'LV95':
+            lv95 = checked
+            wgs84 = np.zeros_like(checked)
+        else:  # WGS84
+            lv95 = np.zeros_like(checked)
+            wgs84 = checked
+        unknown = checked & ~lv95 & ~wgs84
+
+        # Check bounds based on system
+        lv95_b = CH_BOUNDS_LV95
+        wgs84_b = CH_BOUNDS_WGS84
+        e_outside = (
+            (lv95 & ~((lv95_b['e_min'] <= e_values) & (e_values <= lv95_b['e_max'])))
+            | (wgs84 & ~((wgs84_b['lon_min'] <= e_values) & (e_values <= wgs84_b['lon_max'])))
+        )
+        n_outside = (
+            (lv95 & ~((lv95_b['n_min'] <= n_values) & (n_values <= lv95_b['n_max'])))
+            | (wgs84 & ~((wgs84_b['lat_min'] <= n_values) & (n_values <= wgs84_b['lat_max'])))
+        )
 
-            try:
-                e = float(e_val)
-                n = float(n_val)
-            except (ValueError, TypeError):
+        flagged = unparseable | unknown | e_outside | n_outside
+        rows = zip(
+            flagged_rows(df, flagged, e_col, n_col),
+            e_values[flagged].tolist(), n_values[flagged].tolist(),
+            unparseable[flagged], unknown[flagged], lv95[flagged],
+            e_outside[flagged], n_outside[flagged],
+        )
+        for (idx, e_val, n_val), e, n, is_unparseable, is_unknown, is_lv95, e_out, n_out in rows:
+            if is_unparseable:
                 errors.append(ValidationError(
                     row_index=idx,
                     column=f"{e_col}/{n_col}",
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
                     message=f"Ungültige Koordinatenwerte: E={e_val}, N={n_val}",
                     value=f"E={e_val}, N={n_val}",
                 ))
                 continue
 
-            # Auto-detect coordinate system if needed
-            if coord_system == 'auto':
-                detected = detect_coordinate_system(e, n)
-                if detected is None:
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=f"{e_col}/{n_col}",
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"Koordinatensystem nicht erkennbar: E={e}, N={n}",
-                        value=f"E={e}, N={n}",
-                    ))
-                    continue
-                system = detected
+            if is_unknown:
+                errors.append(ValidationError(
+                    row_index=idx,
+                    column=f"{e_col}/{n_col}",
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=f"Koordinatensystem nicht erkennbar: E={e}, N={n}",
+                    value=f"E={e}, N={n}",
+                ))
+                continue
+
+            if is_lv95:
+                e_message = f"E-Koordinate ausserhalb Schweiz: {e} (LV95: {lv95_b['e_min']}-{lv95_b['e_max']})"
+                n_message = f"N-Koordinate ausserhalb Schweiz: {n} (LV95: {lv95_b['n_min']}-{lv95_b['n_max']})"
             else:
-                system = coord_system
-
-            # Check bounds based on system
-            if system == 'LV95':
-                bounds = CH_BOUNDS_LV95
-                if not (bounds['e_min'] <= e <= bounds['e_max']):
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=e_col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"E-Koordinate ausserhalb Schweiz: {e} (LV95: {bounds['e_min']}-{bounds['e_max']})",
-                        value=e,
-                    ))
-                if not (bounds['n_min'] <= n <= bounds['n_max']):
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=n_col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"N-Koordinate ausserhalb Schweiz: {n} (LV95: {bounds['n_min']}-{bounds['n_max']})",
-                        value=n,
-                    ))
-            else:  # WGS84
-                bounds = CH_BOUNDS_WGS84
-                if not (bounds['lon_min'] <= e <= bounds['lon_max']):
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=e_col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"Longitude ausserhalb Schweiz: {e} (WGS84: {bounds['lon_min']}-{bounds['lon_max']})",
-                        value=e,
-                    ))
-                if not (bounds['lat_min'] <= n <= bounds['lat_max']):
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=n_col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"Latitude ausserhalb Schweiz: {n} (WGS84: {bounds['lat_min']}-{bounds['lat_max']})",
-                        value=n,
-                    ))
+                e_message = f"Longitude ausserhalb Schweiz: {e} (WGS84: {wgs84_b['lon_min']}-{wgs84_b['lon_max']})"
+                n_message = f"Latitude ausserhalb Schweiz: {n} (WGS84: {wgs84_b['lat_min']}-{wgs84_b['lat_max']})"
+            if e_out:
+                errors.append(ValidationError(
+                    row_index=idx,
+                    column=e_col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=e_message,
+                    value=e,
+                ))
+            if n_out:
+                errors.append(ValidationError(
+                    row_index=idx,
+                    column=n_col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=n_message,
+                    value=n,
+                ))
 
         return errors
 
@@ -215,60 +261,52 @@ class SwissBoundsRule(BaseRule):
 class CoordinatePrecisionRule(BaseRule):
     """Checks coordinate precision is appropriate."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-COORD-04",
-            name="Coordinate Precision",
-            name_de="Koordinaten-Präzision",
-            description="Checks that coordinates have appropriate precision for building location",
-            description_de="Prüft, ob Koordinaten ausreichende Präzision für Gebäudestandort haben",
-            category=Category.COORDINATES,
-            severity=Severity.WARNING,
-            required_columns=['easting', 'northing'],
-            example_valid="E: 2600123.45, N: 1200456.78",
-            example_invalid="E: 2600000, N: 1200000 (zu rund)",
-        )
+    metadata = RuleMetadata(
+        id="R-COORD-04",
+        name="Coordinate Precision",
+        name_de="Koordinaten-Präzision",
+        description="Checks that coordinates have appropriate precision for building location",
+        description_de="Prüft, ob Koordinaten ausreichende Präzision für Gebäudestandort haben",
+        category=Category.COORDINATES,
+        severity=Severity.WARNING,
+        required_columns=['easting', 'northing'],
+        example_valid="E: 2600123.45, N: 1200456.78",
+        example_invalid="E: 2600000, N: 1200000 (zu rund)",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         e_col = self.get_column(df, config, 'easting')
         n_col = self.get_column(df, config, 'northing')
 
         if e_col is None or n_col is None:
             return errors
 
-        for idx, row in df.iterrows():
-            e_val = row[e_col]
-            n_val = row[n_col]
-
-            if pd.isna(e_val) or pd.isna(n_val):
-                continue
-
-            try:
-                e = float(e_val)
-                n = float(n_val)
-            except (ValueError, TypeError):
-                continue  # Handled by other rules
-
-            # Detect system
-            system = detect_coordinate_system(e, n)
-            if system is None:
-                continue
-
-            # For LV95, check if coordinates are suspiciously round
-            if system == 'LV95':
-                # If both end in 000, likely imprecise
-                if e % 1000 == 0 and n % 1000 == 0:
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=f"{e_col}/{n_col}",
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"Koordinaten ungewöhnlich rund (auf 1000m): E={e}, N={n}",
-                        value=f"E={e}, N={n}",
-                        suggestion="Koordinaten könnten ungenau oder gerundet sein",
-                    ))
+        # Missing and non-numeric values are handled by other rules
+        e_values, e_parsed = self.derived_column(df, config, e_col, parse_coordinates)
+        n_values, n_parsed = self.derived_column(df, config, n_col, parse_coordinates)
+        is_lv95, _ = detect_coordinate_systems(e_values, n_values)
+
+        # For LV95, check if coordinates are suspiciously round
+        # (if both end in 000, likely imprecise)
+        with np.errstate(invalid='ignore'):  # inf % 1000 is NaN, never LV95 anyway
+            suspicious = (
+                e_parsed & n_parsed & is_lv95
+                & (np.mod(e_values, 1000) == 0) & (np.mod(n_values, 1000) == 0)
+            )
+
+        rows = zip(df.index[suspicious].tolist(), e_values[suspicious].tolist(), n_values[suspicious].tolist())
+        for idx, e, n in rows:
+            errors.append(ValidationError(
+                row_index=idx,
+                column=f"{e_col}/{n_col}",
+                rule_id=rule_id,
+                rule_name=rule_name,
+                severity=severity,
+                message=f"Koordinaten ungewöhnlich rund (auf 1000m): E={e}, N={n}",
+                value=f"E={e}, N={n}",
+                suggestion="Koordinaten könnten ungenau oder gerundet sein",
+            ))
 
         return errors
@@ -2,82 +2,120 @@
 EGID (Eidgenössischer Gebäudeidentifikator) validation rules.
 """
 
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Optional, Set
+import re
+import numpy as np
 import pandas as pd
 
-from ..base import BaseRule, RuleMetadata, ValidationError, Category, Severity
+from ..base import (
+    BaseRule, RuleMetadata, ValidationError, Category, Severity,
+    flagged_rows, stripped_strings,
+)
+
+
+# Plain integers, also in float notation like 123456.0 from Excel
+EGID_NUMBER_PATTERN = re.compile(r'[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)')
+
+
+def parse_egid(egid_str: str) -> int:
+    """
+    Parse a stripped EGID string, accepting float notation like '123456.0'.
+
+    Raises ValueError (or OverflowError) if it is not a number.
+    """
+    if '.' in egid_str:
+        return int(float(egid_str))
+    return int(egid_str)
+
+
+def _float_egid_key(egid_str: str) -> Optional[str]:
+    """Comparison key for an EGID in float notation ('123456.0' -> '123456')."""
+    try:
+        return str(int(float(egid_str)))
+    except (ValueError, OverflowError):
+        return None
 
 
 class EGIDFormatRule(BaseRule):
     """Validates EGID format."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-EGID-01",
-            name="EGID Format",
-            name_de="EGID-Format",
-            description="EGID must be a positive integer (federal building identifier)",
-            description_de="EGID muss eine positive Ganzzahl sein (Eidgenössischer Gebäudeidentifikator)",
-            category=Category.EGID,
-            severity=Severity.ERROR,
-            required_columns=['egid'],
-            example_valid="123456789",
-            example_invalid="12-345, EGID123, -500",
-        )
+    metadata = RuleMetadata(
+        id="R-EGID-01",
+        name="EGID Format",
+        name_de="EGID-Format",
+        description="EGID must be a positive integer (federal building identifier)",
+        description_de="EGID muss eine positive Ganzzahl sein (Eidgenössischer Gebäudeidentifikator)",
+        category=Category.EGID,
+        severity=Severity.ERROR,
+        required_columns=['egid'],
+        example_valid="123456789",
+        example_invalid="12-345, EGID123, -500",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         egid_col = self.get_column(df, config, 'egid')
 
         if egid_col is None:
             return errors
 
-        for idx, row in df.iterrows():
-            value = row[egid_col]
+        # EGID might be optional, so empty cells are skipped
+        egid = self.derived_column(df, config, egid_col, stripped_strings)
+        present = (egid != '').to_numpy(dtype=bool)
 
-            if pd.isna(value) or str(value).strip() == '':
-                continue  # EGID might be optional
+        # Plain numbers are parsed column-wise; anything else ('1_000', '12-3',
+        # 'EGID1') goes through parse_egid() one by one
+        simple = egid.str.fullmatch(EGID_NUMBER_PATTERN).to_numpy(dtype=bool)
+        numbers = pd.to_numeric(egid.where(simple), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        numbers = np.trunc(numbers)
+        parsed = simple.copy()
 
+        egid_strings = egid.to_numpy()
+        for pos in np.flatnonzero(present & ~simple):
             try:
-                # Handle float values like 123456.0 from Excel
-                egid_str = str(value).strip()
-                if '.' in egid_str:
-                    egid = int(float(egid_str))
-                else:
-                    egid = int(egid_str)
-
-                if egid <= 0:
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=egid_col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"EGID muss positiv sein: '{value}'",
-                        value=value,
-                    ))
-                elif egid > 999999999:  # EGIDs are typically 9 digits max
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=egid_col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=Severity.WARNING,
-                        message=f"EGID ungewöhnlich gross: '{value}'",
-                        value=value,
-                    ))
-
-            except (ValueError, TypeError):
+                numbers[pos] = parse_egid(egid_strings[pos])
+            except (ValueError, OverflowError):
+                continue
+            parsed[pos] = True
+
+        invalid = present & ~parsed
+        not_positive = parsed & (numbers <= 0)
+        too_large = parsed & (numbers > 999999999)  # EGIDs are typically 9 digits max
+        flagged = invalid | not_positive | too_large
+
+        rows = flagged_rows(df, flagged, egid_col)
+        for (idx, value), is_invalid, is_not_positive in zip(rows, invalid[flagged], not_positive[flagged]):
+            if is_invalid:
                 errors.append(ValidationError(
                     row_index=idx,
                     column=egid_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
                     message=f"Ungültiges EGID-Format: '{value}' (muss eine Zahl sein)",
                     value=value,
                 ))
+            elif is_not_positive:
+                errors.append(ValidationError(
+                    row_index=idx,
+                    column=egid_col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=f"EGID muss positiv sein: '{value}'",
+                    value=value,
+                ))
+            else:
+                errors.append(ValidationError(
+                    row_index=idx,
+                    column=egid_col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=Severity.WARNING,
+                    message=f"EGID ungewöhnlich gross: '{value}'",
+                    value=value,
+                ))
 
         return errors
 
@@ -85,66 +123,65 @@ class EGIDFormatRule(BaseRule):
 class EGIDUniquenessRule(BaseRule):
     """Checks for duplicate EGIDs in the dataset."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-EGID-02",
-            name="EGID Uniqueness",
-            name_de="EGID-Eindeutigkeit",
-            description="Each EGID should appear only once (unless multiple units per building)",
-            description_de="Jedes EGID sollte nur einmal vorkommen (ausser bei mehreren Einheiten pro Gebäude)",
-            category=Category.EGID,
-            severity=Severity.WARNING,
-            required_columns=['egid'],
-            example_valid="123, 456, 789 (alle unterschiedlich)",
-            example_invalid="123, 123, 456 (123 doppelt)",
-        )
+    metadata = RuleMetadata(
+        id="R-EGID-02",
+        name="EGID Uniqueness",
+        name_de="EGID-Eindeutigkeit",
+        description="Each EGID should appear only once (unless multiple units per building)",
+        description_de="Jedes EGID sollte nur einmal vorkommen (ausser bei mehreren Einheiten pro Gebäude)",
+        category=Category.EGID,
+        severity=Severity.WARNING,
+        required_columns=['egid'],
+        example_valid="123, 456, 789 (alle unterschiedlich)",
+        example_invalid="123, 123, 456 (123 doppelt)",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         egid_col = self.get_column(df, config, 'egid')
 
         if egid_col is None:
             return errors
 
-        # Track EGID occurrences
-        egid_rows: Dict[str, List[int]] = {}
-
-        for idx, row in df.iterrows():
-            value = row[egid_col]
-
-            if pd.isna(value) or str(value).strip() == '':
-                continue
-
-            # Normalize EGID (handle floats)
-            try:
-                egid_str = str(value).strip()
-                if '.' in egid_str:
-                    egid_key = str(int(float(egid_str)))
-                else:
-                    egid_key = egid_str
-            except (ValueError, TypeError):
-                continue  # Invalid format handled by format rule
-
-            if egid_key not in egid_rows:
-                egid_rows[egid_key] = []
-            egid_rows[egid_key].append(idx)
+        egid = self.derived_column(df, config, egid_col, stripped_strings)
+
+        # Normalize EGID (handle floats); each distinct float-notation value is
+        # converted once, invalid ones become None (handled by format rule)
+        keys = egid.to_numpy(dtype=object)
+        has_dot = egid.str.contains('.', regex=False).to_numpy(dtype=bool)
+        if has_dot.any():
+            normalized = {value: _float_egid_key(value) for value in pd.unique(keys[has_dot])}
+            keys[has_dot] = [normalized[value] for value in keys[has_dot]]
+        positions = np.flatnonzero((egid != '').to_numpy(dtype=bool) & pd.notna(keys))
+
+        # Rows whose EGID occurs more than once, grouped by EGID in order of
+        # first appearance; the keys are hashed once into integer codes
+        codes, unique_egids = pd.factorize(keys[positions])
+        repeated = np.bincount(codes)[codes] > 1
+        positions, codes = positions[repeated], codes[repeated]
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        starts = np.flatnonzero(np.diff(codes)) + 1
+        groups = np.split(positions[order], starts)
+        duplicate_egids = unique_egids[codes[np.r_[0, starts]]] if len(codes) else []
 
         # Report duplicates
-        for egid, rows in egid_rows.items():
-            if len(rows) > 1:
-                # Report on all but the first occurrence
-                for idx in rows[1:]:
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=egid_col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"EGID '{egid}' kommt mehrfach vor (Zeilen: {', '.join(str(r+2) for r in rows)})",
-                        value=egid,
-                        suggestion="Prüfen Sie, ob es sich um Duplikate oder verschiedene Einheiten handelt",
-                    ))
+        for egid_key, group in zip(duplicate_egids, groups):
+            rows = df.index[group].tolist()
+            row_numbers = ', '.join(str(r + 2) for r in rows)
+            # Report on all but the first occurrence
+            for idx in rows[1:]:
+                errors.append(ValidationError(
+                    row_index=idx,
+                    column=egid_col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=f"EGID '{egid_key}' kommt mehrfach vor (Zeilen: {row_numbers})",
+                    value=egid_key,
+                    suggestion="Prüfen Sie, ob es sich um Duplikate oder verschiedene Einheiten handelt",
+                ))
 
         return errors
 
@@ -152,40 +189,39 @@ class EGIDUniquenessRule(BaseRule):
 class EGIDPresenceRule(BaseRule):
     """Checks that EGID is provided for all records."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-EGID-03",
-            name="EGID Presence",
-            name_de="EGID vorhanden",
-            description="Every building record should have an EGID",
-            description_de="Jeder Gebäudedatensatz sollte eine EGID haben",
-            category=Category.EGID,
-            severity=Severity.ERROR,
-            required_columns=['egid'],
-            example_valid="123456789",
-            example_invalid="(leer)",
-        )
+    metadata = RuleMetadata(
+        id="R-EGID-03",
+        name="EGID Presence",
+        name_de="EGID vorhanden",
+        description="Every building record should have an EGID",
+        description_de="Jeder Gebäudedatensatz sollte eine EGID haben",
+        category=Category.EGID,
+        severity=Severity.ERROR,
+        required_columns=['egid'],
+        example_valid="123456789",
+        example_invalid="(leer)",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
         egid_col = self.get_column(df, config, 'egid')
 
         if egid_col is None:
             return errors
 
-        for idx, row in df.iterrows():
-            value = row[egid_col]
-
-            if pd.isna(value) or str(value).strip() == '':
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column=egid_col,
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
-                    message="EGID fehlt",
-                    value=None,
-                ))
+        missing = (self.derived_column(df, config, egid_col, stripped_strings) == '').to_numpy(dtype=bool)
+        errors.extend(
+            ValidationError(
+                row_index=idx,
+                column=egid_col,
+                rule_id=rule_id,
+                rule_name=rule_name,
+                severity=severity,
+                message="EGID fehlt",
+                value=None,
+            )
+            for idx in df.index[missing].tolist()
+        )
 
         return errors
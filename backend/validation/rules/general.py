@@ -3,32 +3,37 @@ General data quality validation rules.
 """
 
 from typing import List, Dict, Any, Set, Tuple
+import re
+import numpy as np
 import pandas as pd
-import hashlib
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
 
-from ..base import BaseRule, RuleMetadata, ValidationError, Category, Severity
+from ..base import (
+    BaseRule, RuleMetadata, ValidationError, Category, Severity,
+    TEXT_DTYPE, flagged_rows, stripped_strings,
+)
+from .coordinates import parse_coordinates
 
 
 class DuplicateRowsRule(BaseRule):
     """Detects duplicate rows in the dataset."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-GEN-01",
-            name="Duplicate Rows",
-            name_de="Doppelte Zeilen",
-            description="Detects rows that appear to be duplicates based on key fields",
-            description_de="Erkennt Zeilen, die auf Basis von Schlüsselfeldern Duplikate zu sein scheinen",
-            category=Category.GENERAL,
-            severity=Severity.WARNING,
-            required_columns=[],
-            example_valid="Jede Zeile ist einzigartig",
-            example_invalid="Zeile 5 und Zeile 10 sind identisch",
-        )
+    metadata = RuleMetadata(
+        id="R-GEN-01",
+        name="Duplicate Rows",
+        name_de="Doppelte Zeilen",
+        description="Detects rows that appear to be duplicates based on key fields",
+        description_de="Erkennt Zeilen, die auf Basis von Schlüsselfeldern Duplikate zu sein scheinen",
+        category=Category.GENERAL,
+        severity=Severity.WARNING,
+        required_columns=[],
+        example_valid="Jede Zeile ist einzigartig",
+        example_invalid="Zeile 5 und Zeile 10 sind identisch",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
 
         # Use key columns if specified, otherwise use all columns
         key_cols = config.get('options', {}).get('duplicate_key_columns', None)
@@ -42,28 +47,35 @@ class DuplicateRowsRule(BaseRule):
         else:
             check_df = df
 
-        # Find duplicates
-        seen: Dict[str, int] = {}
-
-        for idx, row in check_df.iterrows():
-            # Create a hash of the row values
-            row_str = '|'.join(str(v) for v in row.values)
-            row_hash = hashlib.md5(row_str.encode()).hexdigest()
-
-            if row_hash in seen:
-                first_idx = seen[row_hash]
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column='(alle)',
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
-                    message=f"Mögliches Duplikat von Zeile {first_idx + 2}",
-                    value=None,
-                    suggestion="Prüfen Sie, ob diese Zeile versehentlich doppelt erfasst wurde",
-                ))
-            else:
-                seen[row_hash] = idx
+        if check_df.empty:
+            return errors
+
+        # Group rows by their text values (like the former '|'.join(str(v)) key);
+        # integer and boolean columns compare the same as numbers, so only the
+        # other columns are converted. Group ids are numbered in order of first
+        # appearance.
+        keys = check_df.astype({
+            col: TEXT_DTYPE for col, dtype in check_df.dtypes.items() if dtype.kind not in 'iub'
+        })
+        group_ids = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+
+        # First row of each group; every other row is a repeat of it
+        _, first_positions = np.unique(group_ids, return_index=True)
+        first_of_row = first_positions[group_ids]
+        duplicates = np.flatnonzero(first_of_row != np.arange(len(group_ids)))
+        first_rows = check_df.index[first_of_row[duplicates]].tolist()
+
+        for idx, first_idx in zip(check_df.index[duplicates].tolist(), first_rows):
+            errors.append(ValidationError(
+                row_index=idx,
+                column='(alle)',
+                rule_id=rule_id,
+                rule_name=rule_name,
+                severity=severity,
+                message=f"Mögliches Duplikat von Zeile {first_idx + 2}",
+                value=None,
+                suggestion="Prüfen Sie, ob diese Zeile versehentlich doppelt erfasst wurde",
+            ))
 
         return errors
 
@@ -71,41 +83,41 @@ class DuplicateRowsRule(BaseRule):
 class EmptyRowsRule(BaseRule):
     """Detects completely empty rows."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-GEN-02",
-            name="Empty Rows",
-            name_de="Leere Zeilen",
-            description="Detects rows where all cells are empty",
-            description_de="Erkennt Zeilen, in denen alle Zellen leer sind",
-            category=Category.GENERAL,
-            severity=Severity.INFO,
-            required_columns=[],
-            example_valid="Zeile hat mindestens einen Wert",
-            example_invalid="Komplett leere Zeile",
-        )
+    metadata = RuleMetadata(
+        id="R-GEN-02",
+        name="Empty Rows",
+        name_de="Leere Zeilen",
+        description="Detects rows where all cells are empty",
+        description_de="Erkennt Zeilen, in denen alle Zellen leer sind",
+        category=Category.GENERAL,
+        severity=Severity.INFO,
+        required_columns=[],
+        example_valid="Zeile hat mindestens einen Wert",
+        example_invalid="Komplett leere Zeile",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
 
-        for idx, row in df.iterrows():
-            # Check if all values are empty/NaN
-            is_empty = all(
-                pd.isna(v) or str(v).strip() == ''
-                for v in row.values
-            )
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
 
-            if is_empty:
-                errors.append(ValidationError(
-                    row_index=idx,
-                    column='(alle)',
-                    rule_id=self.metadata.id,
-                    rule_name=self.metadata.name_de,
-                    severity=self.metadata.severity,
-                    message="Zeile ist komplett leer",
-                    value=None,
-                ))
+        # A row is empty if every cell is missing or whitespace only
+        empty = np.ones(len(df), dtype=bool)
+        for col in df.columns:
+            empty &= (self.derived_column(df, config, col, stripped_strings) == '').to_numpy(dtype=bool)
+
+        errors.extend(
+            ValidationError(
+                row_index=idx,
+                column='(alle)',
+                rule_id=rule_id,
+                rule_name=rule_name,
+                severity=severity,
+                message="Zeile ist komplett leer",
+                value=None,
+            )
+            for idx in df.index[empty].tolist()
+        )
 
         return errors
 
@@ -113,26 +125,25 @@ class EmptyRowsRule(BaseRule):
 class DataTypeConsistencyRule(BaseRule):
     """Checks for inconsistent data types in columns."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-GEN-03",
-            name="Data Type Consistency",
-            name_de="Datentyp-Konsistenz",
-            description="Checks that numeric columns contain only numeric values",
-            description_de="Prüft, ob numerische Spalten nur numerische Werte enthalten",
-            category=Category.GENERAL,
-            severity=Severity.WARNING,
-            required_columns=[],
-            example_valid="PLZ-Spalte enthält nur Zahlen",
-            example_invalid="PLZ-Spalte enthält 'k.A.', 'n/a'",
-        )
+    metadata = RuleMetadata(
+        id="R-GEN-03",
+        name="Data Type Consistency",
+        name_de="Datentyp-Konsistenz",
+        description="Checks that numeric columns contain only numeric values",
+        description_de="Prüft, ob numerische Spalten nur numerische Werte enthalten",
+        category=Category.GENERAL,
+        severity=Severity.WARNING,
+        required_columns=[],
+        example_valid="PLZ-Spalte enthält nur Zahlen",
+        example_invalid="PLZ-Spalte enthält 'k.A.', 'n/a'",
+    )
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
 
-        # Check numeric columns
-        numeric_cols = config.get('options', {}).get('numeric_columns', [])
+        # Check numeric columns (copied, the auto-detected ones must not end up in the options)
+        numeric_cols = list(config.get('options', {}).get('numeric_columns', []))
 
         # Auto-detect from column mappings
         columns = config.get('columns', {})
@@ -146,25 +157,21 @@ class DataTypeConsistencyRule(BaseRule):
             if col not in df.columns:
                 continue
 
-            for idx, row in df.iterrows():
-                value = row[col]
-
-                if pd.isna(value) or str(value).strip() == '':
-                    continue
-
-                # Check if value is numeric
-                try:
-                    float(value)
-                except (ValueError, TypeError):
-                    errors.append(ValidationError(
-                        row_index=idx,
-                        column=col,
-                        rule_id=self.metadata.id,
-                        rule_name=self.metadata.name_de,
-                        severity=self.metadata.severity,
-                        message=f"Nicht-numerischer Wert in numerischer Spalte: '{value}'",
-                        value=value,
-                    ))
+            # Same float() check per value, shared with the coordinate rules' cache
+            _, parsed = self.derived_column(df, config, col, parse_coordinates)
+            present = (self.derived_column(df, config, col, stripped_strings) != '').to_numpy(dtype=bool)
+            errors.extend(
+                ValidationError(
+                    row_index=idx,
+                    column=col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=f"Nicht-numerischer Wert in numerischer Spalte: '{value}'",
+                    value=value,
+                )
+                for idx, value in flagged_rows(df, present & ~parsed, col)
+            )
 
         return errors
 
@@ -172,20 +179,18 @@ class DataTypeConsistencyRule(BaseRule):
 class EncodingIssuesRule(BaseRule):
     """Detects character encoding problems."""
 
-    @property
-    def metadata(self) -> RuleMetadata:
-        return RuleMetadata(
-            id="R-GEN-04",
-            name="Encoding Issues",
-            name_de="Zeichenkodierung",
-            description="Detects potential character encoding problems (replacement characters, etc.)",
-            description_de="Erkennt mögliche Zeichenkodierungsprobleme (Ersetzungszeichen, etc.)",
-            category=Category.GENERAL,
-            severity=Severity.WARNING,
-            required_columns=[],
-            example_valid="Zürich, Genève, Müller",
-            example_invalid="Z�rich, Gen�ve, M�ller",
-        )
+    metadata = RuleMetadata(
+        id="R-GEN-04",
+        name="Encoding Issues",
+        name_de="Zeichenkodierung",
+        description="Detects potential character encoding problems (replacement characters, etc.)",
+        description_de="Erkennt mögliche Zeichenkodierungsprobleme (Ersetzungszeichen, etc.)",
+        category=Category.GENERAL,
+        severity=Severity.WARNING,
+        required_columns=[],
+        example_valid="Zürich, Genève, Müller",
+        example_invalid="Z�rich, Gen�ve, M�ller",
+    )
 
     # Common encoding problem indicators
     ENCODING_ISSUES = [
@@ -198,31 +203,37 @@ class EncodingIssuesRule(BaseRule):
         'Ã ',    # UTF-8 interpreted as Latin-1 (à)
         '\x00',  # Null character
     ]
+    # The same indicators factored into character classes, so a cell is
+    # scanned for all of them in one pass
+    ENCODING_ISSUE_PATTERN = re.compile('[�\x00]|Ã[¼¤¶©¨ ]')
 
     def validate(self, df: pd.DataFrame, config: Dict[str, Any]) -> List[ValidationError]:
         errors = []
 
+        rule_id, rule_name, severity = self.metadata.id, self.metadata.name_de, self.metadata.severity
+
         for col in df.columns:
-            for idx, row in df.iterrows():
-                value = row[col]
+            # Numbers, booleans and dates never print as one of the issues
+            series = df[col]
+            if is_numeric_dtype(series) or is_datetime64_any_dtype(series):
+                continue
 
-                if pd.isna(value):
-                    continue
+            # One regex pass per column instead of a substring scan per issue and cell
+            has_issue = series.astype(TEXT_DTYPE).str.contains(self.ENCODING_ISSUE_PATTERN, na=False).to_numpy(dtype=bool)
+            if not has_issue.any():
+                continue  # Clean column, the common case
 
+            for idx, value in flagged_rows(df, has_issue, col):
                 value_str = str(value)
-
-                for issue in self.ENCODING_ISSUES:
-                    if issue in value_str:
-                        errors.append(ValidationError(
-                            row_index=idx,
-                            column=col,
-                            rule_id=self.metadata.id,
-                            rule_name=self.metadata.name_de,
-                            severity=self.metadata.severity,
-                            message=f"Mögliches Kodierungsproblem: '{value_str[:50]}...' " if len(value_str) > 50 else f"Mögliches Kodierungsproblem: '{value_str}'",
-                            value=value_str[:100],
-                            suggestion="Prüfen Sie die Zeichenkodierung der Quelldatei (UTF-8 empfohlen)",
-                        ))
-                        break  # Only report once per cell
+                errors.append(ValidationError(
+                    row_index=idx,
+                    column=col,
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    severity=severity,
+                    message=f"Mögliches Kodierungsproblem: '{value_str[:50]}...' " if len(value_str) > 50 else f"Mögliches Kodierungsproblem: '{value_str}'",
+                    value=value_str[:100],
+                    suggestion="Prüfen Sie die Zeichenkodierung der Quelldatei (UTF-8 empfohlen)",
+                ))
 
         return errors